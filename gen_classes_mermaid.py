@@ -1,78 +1,143 @@
-import ast, os, sys
+import ast, os, pickle, sys
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 
-root = sys.argv[1] if len(sys.argv) > 1 else "."
+def dotted(module, name): return f"{module}.{name}" if module else name
 
-classes = {}
-defined = set()
+def _self_attrs(fn_node):
+    # one walk, one type check per node: collect `self.x = ...` / `self.x: T = ...` targets
+    found = {}
+    for s in ast.walk(fn_node):
+        t = type(s)
+        if t is ast.Assign:
+            targets = s.targets
+        elif t is ast.AnnAssign:
+            targets = (s.target,)
+        else:
+            continue
+        for tgt in targets:
+            if type(tgt) is ast.Attribute and type(tgt.value) is ast.Name and tgt.value.id == "self":
+                found[tgt.attr] = None
+    return found
+
+def scan_file(module, path):
+    # bytes go straight to the tokenizer (no str decode here; honours coding cookies)
+    with open(path, "rb") as fh:
+        try:
+            tree = ast.parse(fh.read(), filename=path, type_comments=False)
+        except Exception:
+            return {}
+
+    found = {}
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef):
+            name = dotted(module, node.name)
+            # dicts as ordered sets: dedup + definition order, nothing to sort when printing
+            bases = {}
+            for b in node.bases:
+                if isinstance(b, ast.Name):
+                    bases[b.id] = None
+                elif isinstance(b, ast.Attribute):
+                    bases[b.attr] = None
+            attrs, methods = {}, {}
+            for stmt in node.body:
+                if isinstance(stmt, ast.FunctionDef):
+                    if not stmt.name.startswith("__"):
+                        methods[stmt.name] = None
+                    if stmt.name == "__init__":
+                        attrs.update(_self_attrs(stmt))
+                elif isinstance(stmt, (ast.Assign, ast.AnnAssign)):
+                    targets = [stmt.target] if isinstance(stmt, ast.AnnAssign) else stmt.targets
+                    for t in targets:
+                        if isinstance(t, ast.Name):
+                            attrs[t.id] = None
+            found[name] = {"bases": bases, "attrs": attrs, "methods": methods}
+    return found
+
+# {abs path: (mtime_ns, size, module, classes found in file)} - unchanged files are not re-parsed
+CACHE_VERSION = 2
+CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", f"gen_classes_mermaid.v{CACHE_VERSION}.pkl")
+
+def load_cache():
+    try:
+        with open(CACHE_PATH, "rb") as fh:
+            return pickle.load(fh)
+    except Exception:
+        return {}
+
+def save_cache(cache):
+    try:
+        os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+        with open(CACHE_PATH, "wb") as fh:
+            pickle.dump(cache, fh)
+    except OSError:
+        pass
+
+# below this many uncached files, process start-up costs more than it saves
+PARALLEL_MIN_FILES = 32
+
+def main():
+    root = sys.argv[1] if len(sys.argv) > 1 else "."
+    classes = {}
+    defined = set()
+
+    cache = load_cache()
+    entries, misses = [], []
+    for dirpath, _, files in os.walk(root):
+        module = os.path.relpath(dirpath, root).replace(os.sep, ".")
+        if module == ".": module = ""
+        for f in files:
+            if not f.endswith(".py"): continue
+            path = os.path.join(dirpath, f)
+            key = os.path.abspath(path)
+            st = os.stat(path)
+            entries.append(key)
+            hit = cache.get(key)
+            if not (hit and hit[:3] == (st.st_mtime_ns, st.st_size, module)):
+                misses.append((key, module, path, st))
+
+    if misses:
+        mods = [m for _, m, _, _ in misses]
+        paths = [p for _, _, p, _ in misses]
+        if len(misses) >= PARALLEL_MIN_FILES:
+            with ProcessPoolExecutor() as ex:
+                results = list(ex.map(scan_file, mods, paths, chunksize=16))
+        else:
+            results = list(map(scan_file, mods, paths))
+        for (key, module, _, st), found in zip(misses, results):
+            cache[key] = (st.st_mtime_ns, st.st_size, module, found)
+        save_cache(cache)
+
+    for key in entries:
+        for name, info in cache[key][3].items():
+            defined.add(name.rsplit(".", 1)[-1])
+            classes[name] = info
+
+    print("classDiagram")
+    for cname, info in classes.items():
+        safe = cname.replace(".", "_")
+        print(f"class {safe} {{")
+        for a in info["attrs"]:
+            print(f"  {a}")
+        for m in info["methods"]:
+            print(f"  {m}()")
+        print("}")
+    all_names = {k.split(".")[-1] for k in classes.keys()}
+    by_short = defaultdict(list)
+    for full in classes.keys():
+        by_short[full.split(".")[-1]].append(full)
+
+    def map_name(n):
+        if n in all_names and len(by_short[n]) == 1:
+            return by_short[n][0].replace(".", "_")
+        return n.replace(".", "_")
+
+    for child, info in classes.items():
+        child_id = child.replace(".", "_")
+        for b in info["bases"]:
+            if b in all_names:
+                print(f"{map_name(b)} <|-- {child_id}")
 
-def dotted(module, name): return f"{module}.{name}" if module else name
 
-for dirpath, _, files in os.walk(root):
-    module = os.path.relpath(dirpath, root).replace(os.sep, ".")
-    if module == ".": module = ""
-    for f in files:
-        if not f.endswith(".py"): continue
-        path = os.path.join(dirpath, f)
-        with open(path, "r", encoding="utf-8") as fh:
-            try:
-                tree = ast.parse(fh.read(), filename=path)
-            except Exception:
-                continue
-
-        for node in tree.body:
-            if isinstance(node, ast.ClassDef):
-                name = dotted(module, node.name)
-                defined.add(node.name)
-                bases = set()
-                for b in node.bases:
-                    if isinstance(b, ast.Name):
-                        bases.add(b.id)
-                    elif isinstance(b, ast.Attribute):
-                        bases.add(b.attr)
-                attrs, methods = set(), set()
-                for stmt in node.body:
-                    if isinstance(stmt, ast.FunctionDef):
-                        if not stmt.name.startswith("__"):
-                            methods.add(stmt.name)
-                        if stmt.name == "__init__":
-                            for s in ast.walk(stmt):
-                                if isinstance(s, ast.Assign):
-                                    for t in s.targets:
-                                        if isinstance(t, ast.Attribute) and isinstance(t.value, ast.Name) and t.value.id == "self":
-                                            attrs.add(t.attr)
-                                if isinstance(s, ast.AnnAssign):
-                                    t = s.target
-                                    if isinstance(t, ast.Attribute) and isinstance(t.value, ast.Name) and t.value.id == "self":
-                                        attrs.add(t.attr)
-                    elif isinstance(stmt, (ast.Assign, ast.AnnAssign)):
-                        targets = [stmt.target] if isinstance(stmt, ast.AnnAssign) else stmt.targets
-                        for t in targets:
-                            if isinstance(t, ast.Name):
-                                attrs.add(t.id)
-                classes[name] = {"bases": bases, "attrs": attrs, "methods": methods}
-
-print("classDiagram")
-for cname, info in classes.items():
-    safe = cname.replace(".", "_")
-    print(f"class {safe} {{")
-    for a in sorted(info["attrs"]):
-        print(f"  {a}")
-    for m in sorted(info["methods"]):
-        print(f"  {m}()")
-    print("}")
-all_names = {k.split(".")[-1] for k in classes.keys()}
-by_short = defaultdict(list)
-for full in classes.keys():
-    by_short[full.split(".")[-1]].append(full)
-
-def map_name(n):
-    if n in all_names and len(by_short[n]) == 1:
-        return by_short[n][0].replace(".", "_")
-    return n.replace(".", "_")
-
-for child, info in classes.items():
-    child_id = child.replace(".", "_")
-    for b in info["bases"]:
-        if b in all_names:
-            print(f"{map_name(b)} <|-- {child_id}")
+if __name__ == "__main__":
+    main()
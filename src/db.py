@@ -1,29 +1,52 @@
 # db.py
+import asyncio
+import hashlib
 import os
-from typing import List, Optional, Sequence, Tuple, Union, Dict
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from decimal import Decimal
+from functools import lru_cache
+from typing import Iterator, List, Optional, Sequence, Tuple, Union, Dict
 
 import bcrypt
-import mysql.connector
 from dotenv import load_dotenv
-from mysql.connector.errors import IntegrityError, Error as MySQLError
+from mysql.connector.cursor import MySQLCursor
+from mysql.connector.errors import IntegrityError, PoolError, Error as MySQLError
+from mysql.connector.pooling import MySQLConnectionPool, PooledMySQLConnection
 
 load_dotenv()
 
-OrderRow = Tuple[int, str, str, str, float]
+# money columns come back as the driver's Decimal; callers format/convert at display time
+OrderRow = Tuple[int, str, str, str, Decimal]
 
-class DatabaseManager:
+# bcrypt work factor; keep >= 10 in production, 4 is fine for local dev
+_BCRYPT_COST = int(os.getenv("BCRYPT_COST", "12"))
+# how long a successful bcrypt check is remembered (seconds); 0 disables the cache
+_VERIFY_TTL = float(os.getenv("VERIFY_CACHE_TTL", "30"))
 
-    STATUS_FLOW: Dict[str, List[str]] = {
-        "RECEIVED":    ["IN_PROGRESS", "CANCELED"],
-        "IN_PROGRESS": ["READY", "CANCELED"],
-        "READY":       ["COMPLETED", "CANCELED"],
-        "COMPLETED":   [],
-        "CANCELED":    [],
-    }
+# how long a borrower waits for a free pooled connection before PoolError (seconds)
+_POOL_WAIT = float(os.getenv("DB_POOL_WAIT", "5"))
 
-    # lifecycle
-    def __init__(self):
-        self.conn = mysql.connector.connect(
+# menu/category reads are reused for this long (seconds); our own writes clear them at once,
+# the TTL bounds how long another client's menu edit can go unseen
+_MENU_CACHE_TTL = float(os.getenv("DB_MENU_CACHE_TTL", "5"))
+
+# shared by every DatabaseManager; created on first use so importing db.py never connects
+_POOL: Optional[MySQLConnectionPool] = None
+
+
+def _get_pool() -> MySQLConnectionPool:
+    global _POOL
+    if _POOL is None:
+        _POOL = MySQLConnectionPool(
+            pool_name="rot",
+            pool_size=int(os.getenv("DB_POOL_SIZE", "5")),
+            pool_reset_session=False,
+            # C extension (libmysqlclient row parsing, same engine as mysqlclient/MySQLdb); it is the
+            # connector's default when installed, pinned here so a pure-Python fallback is explicit
+            use_pure=os.getenv("DB_USE_PURE", "0") == "1",
             host=os.getenv("DB_HOST", "127.0.0.1"),
             port=int(os.getenv("DB_PORT", "3307")),
             user=os.getenv("DB_USER", "restaurant_app"),
@@ -31,179 +54,428 @@ class DatabaseManager:
             database=os.getenv("DB_NAME", "restaurant"),
             auth_plugin="mysql_native_password",
         )
-        # buffered=True
-        self.cur = self.conn.cursor(buffered=True)
-        self.current_user_id: Optional[int] = None
-        self._ensure_schema()
+    return _POOL
+
+
+# role access-code setting -> (env var, default) used when the row is first created
+_ACCESS_CODE_DEFAULTS: Dict[str, Tuple[str, str]] = {
+    "admin_access_code_hash": ("ADMIN_ACCESS_CODE", "ADMIN123"),
+    "chef_access_code_hash": ("CHEF_ACCESS_CODE", "CHEF123"),
+    "courier_access_code_hash": ("COURIER_ACCESS_CODE", "COURIER123"),
+}
+
+# SQL: fixed statements live here; methods only append dynamic filters
+_SQL_AUTH_USER = "SELECT user_id, username, password_hash, role FROM Users WHERE username=%s"
+_SQL_AUTH_ADMIN = "SELECT user_id, password_hash FROM Users WHERE role='admin' ORDER BY user_id LIMIT 1"
+_SQL_INSERT_USER = "INSERT INTO Users (username, password_hash, role) VALUES (%s,%s,%s)"
+_SQL_USER_PW_HASH = "SELECT password_hash FROM Users WHERE user_id=%s"
+_SQL_UPDATE_USER_PW = "UPDATE Users SET password_hash=%s WHERE user_id=%s"
+_SQL_SETTING = "SELECT setting_value FROM AppSettings WHERE setting_key=%s"
+_SQL_UPDATE_SETTING = "UPDATE AppSettings SET setting_value=%s WHERE setting_key=%s"
+
+_SQL_CATEGORIES = "SELECT category_id, name FROM MenuCategories ORDER BY name"
+_SQL_INSERT_CATEGORY = "INSERT INTO MenuCategories (name) VALUES (%s)"
+# on a duplicate name LAST_INSERT_ID(pk) hands the existing id back through lastrowid
+_SQL_GET_OR_CREATE_CATEGORY = (
+    "INSERT INTO MenuCategories (name) VALUES (%s) "
+    "ON DUPLICATE KEY UPDATE category_id=LAST_INSERT_ID(category_id)"
+)
+_SQL_DELETE_CATEGORY = "DELETE FROM MenuCategories WHERE category_id=%s"
+
+_SQL_MENU_ITEMS = "SELECT item_id, name, price, category_id, is_active FROM MenuItems WHERE 1=1"
+_SQL_INSERT_MENU_ITEM = "INSERT INTO MenuItems (name, price, category_id, is_active) VALUES (%s,%s,%s,%s)"
+_SQL_GET_OR_CREATE_MENU_ITEM = (
+    "INSERT INTO MenuItems (name, price, category_id, is_active) VALUES (%s,%s,%s,%s) "
+    "ON DUPLICATE KEY UPDATE item_id=LAST_INSERT_ID(item_id)"
+)
+_SQL_UPDATE_MENU_ITEM = "UPDATE MenuItems SET name=%s, price=%s, category_id=%s, is_active=%s WHERE item_id=%s"
+_SQL_DELETE_MENU_ITEM_BY_ID = "DELETE FROM MenuItems WHERE item_id=%s"
+_SQL_DELETE_MENU_ITEM_BY_NAME = "DELETE FROM MenuItems WHERE name=%s"
+_SQL_ITEM_ID_BY_NAME = "SELECT item_id FROM MenuItems WHERE name=%s LIMIT 1"
+
+_SQL_INSERT_ORDER = """
+INSERT INTO Orders (customer_name, customer_contact, order_date, status_code, user_id, notes, service_type, delivery_address)
+VALUES (%s,%s,NOW(),%s,%s,%s,%s,%s)
+"""
+# pre-migration Orders table without service_type/delivery_address
+_SQL_INSERT_ORDER_LEGACY = """
+INSERT INTO Orders (customer_name, customer_contact, order_date, status_code, user_id, notes)
+VALUES (%s,%s,NOW(),%s,%s,%s)
+"""
+_SQL_INSERT_ORDER_ITEM = "INSERT INTO OrderItems (order_id, item_id, quantity, price_at_order) VALUES (%s,%s,%s,%s)"
+_SQL_DELETE_ORDER_ITEMS = "DELETE FROM OrderItems WHERE order_id=%s"
+_SQL_ORDER_OWNER_STATUS = "SELECT user_id, status_code FROM Orders WHERE order_id=%s"
+_SQL_ORDER_STATUS = "SELECT status_code FROM Orders WHERE order_id=%s"
+_SQL_CANCEL_ORDER = "UPDATE Orders SET status_code='CANCELED' WHERE order_id=%s AND user_id=%s AND "
+
+# per-row total via the OrderItems PK prefix; unlike joining v_order_totals (a GROUP BY view
+# MySQL materialises over every order), this only aggregates the rows the LIMIT keeps
+_SQL_ORDER_TOTAL = "(SELECT COALESCE(SUM(oi.quantity * oi.price_at_order),0) FROM OrderItems oi WHERE oi.order_id = o.order_id)"
+
+_SQL_ORDER_LIST = f"""
+SELECT o.order_id, DATE_FORMAT(o.order_date, '%Y-%m-%d %H:%i'),
+       COALESCE(o.customer_name,''), o.status_code, {_SQL_ORDER_TOTAL}
+FROM Orders o
+"""
+_SQL_DELIVERY_LIST = f"""
+SELECT o.order_id,
+       DATE_FORMAT(o.order_date, '%Y-%m-%d %H:%i'),
+       COALESCE(o.customer_name,''),
+       o.status_code,
+       {_SQL_ORDER_TOTAL},
+       COALESCE(o.delivery_address,'')
+FROM Orders o
+WHERE o.service_type='DELIVERY'
+"""
+# window SUM carries the order total on every line, so no second pass in Python
+_SQL_ORDER_ITEMS = """
+SELECT mi.name, oi.quantity, oi.price_at_order, (oi.quantity * oi.price_at_order) AS subtotal,
+       SUM(oi.quantity * oi.price_at_order) OVER () AS total
+FROM OrderItems oi
+JOIN MenuItems mi ON mi.item_id = oi.item_id
+WHERE oi.order_id=%s
+ORDER BY mi.name
+"""
+_ORDER_SEARCH_COLS = ("o.customer_name", "o.customer_contact", "o.notes")
+_DELIVERY_SEARCH_COLS = _ORDER_SEARCH_COLS + ("o.delivery_address",)
+_SQL_STATUS_LIST = "SELECT status_code FROM OrderStatusRef ORDER BY sort_order"
+# seek past a known order in (order_date DESC, order_id DESC) order: the next page, not OFFSET
+_SQL_SEEK_BEFORE = " AND (o.order_date, o.order_id) < (SELECT p.order_date, p.order_id FROM Orders p WHERE p.order_id=%s)"
+_SQL_NEWEST_FIRST = " ORDER BY o.order_date DESC, o.order_id DESC LIMIT %s"
+
+
+# report SQL depends only on these shape flags, so each variant is assembled once per process
+@lru_cache(maxsize=64)
+def _report_orders_sql(have_service: bool, n_statuses: int, seek: bool, paged: bool) -> str:
+    service_sql = "o.service_type" if have_service else "NULL"
+    sql = f"""
+    SELECT o.order_id,
+           DATE_FORMAT(o.order_date, '%Y-%m-%d %H:%i'),
+           COALESCE(o.customer_name,''),
+           o.status_code,
+           {service_sql} AS service_type,
+           {_SQL_ORDER_TOTAL}
+    FROM Orders o
+    WHERE o.order_date BETWEEN %s AND %s
+    """
+    if n_statuses:
+        sql += " AND o.status_code IN (" + ",".join(["%s"] * n_statuses) + ")"
+    if seek:
+        sql += _SQL_SEEK_BEFORE
+    sql += " ORDER BY o.order_date DESC, o.order_id DESC"
+    if paged:
+        sql += " LIMIT %s"
+    return sql
+
+
+@lru_cache(maxsize=32)
+def _report_top_items_sql(n_statuses: int) -> str:
+    # aggregate on the INT item_id (names are UNIQUE, so same groups) and only join MenuItems
+    # for the top-N survivors; idx_oi_cover + its implicit PK suffix make the inner part index-only
+    sql = """
+    SELECT mi.name, t.qty, t.revenue
+    FROM (
+        SELECT oi.item_id,
+               SUM(oi.quantity) AS qty,
+               SUM(oi.quantity * oi.price_at_order) AS revenue
+        FROM OrderItems oi
+        JOIN Orders o ON o.order_id = oi.order_id
+        WHERE o.order_date BETWEEN %s AND %s
+    """
+    if n_statuses:
+        sql += " AND o.status_code IN (" + ",".join(["%s"] * n_statuses) + ")"
+    sql += """
+        GROUP BY oi.item_id
+        ORDER BY qty DESC, revenue DESC
+        LIMIT %s
+    ) t
+    JOIN MenuItems mi ON mi.item_id = t.item_id
+    ORDER BY t.qty DESC, t.revenue DESC
+    """
+    return sql
+
+
+def _invert_flow(flow: Dict[str, Tuple[str, ...]]) -> Dict[str, Tuple[str, ...]]:
+    # next status -> current statuses allowed to move to it, in flow order
+    prev: Dict[str, Tuple[str, ...]] = {}
+    for cur, nexts in flow.items():
+        for nxt in nexts:
+            prev[nxt] = prev.get(nxt, ()) + (cur,)
+    return prev
+
+
+# base tables, sent as one multi-statement batch (IF NOT EXISTS keeps restarts idempotent)
+_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS Users (
+    user_id INT PRIMARY KEY AUTO_INCREMENT,
+    username VARCHAR(50) NOT NULL UNIQUE,
+    password_hash VARCHAR(100) NOT NULL,
+    role ENUM('admin','user') NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS MenuCategories (
+    category_id INT PRIMARY KEY AUTO_INCREMENT,
+    name VARCHAR(60) NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS MenuItems (
+    item_id INT PRIMARY KEY AUTO_INCREMENT,
+    category_id INT NOT NULL,
+    name VARCHAR(100) NOT NULL UNIQUE,
+    price DECIMAL(10,2) NOT NULL CHECK (price >= 0),
+    is_active TINYINT(1) NOT NULL DEFAULT 1,
+    CONSTRAINT fk_item_cat FOREIGN KEY (category_id)
+        REFERENCES MenuCategories(category_id) ON DELETE RESTRICT
+);
+
+CREATE TABLE IF NOT EXISTS OrderStatusRef (
+    status_code VARCHAR(20) PRIMARY KEY,
+    sort_order INT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS Orders (
+    order_id INT PRIMARY KEY AUTO_INCREMENT,
+    customer_name VARCHAR(100),
+    customer_contact VARCHAR(100),
+    order_date DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    status_code VARCHAR(20) NOT NULL,
+    user_id INT,
+    notes VARCHAR(255),
+    service_type ENUM('DINE_IN','TAKEAWAY','DELIVERY') DEFAULT 'TAKEAWAY',
+    delivery_address VARCHAR(255) NULL,
+    CONSTRAINT fk_orders_user FOREIGN KEY (user_id)
+        REFERENCES Users(user_id) ON DELETE SET NULL,
+    CONSTRAINT fk_orders_status FOREIGN KEY (status_code)
+        REFERENCES OrderStatusRef(status_code) ON DELETE RESTRICT
+);
+
+CREATE TABLE IF NOT EXISTS OrderItems (
+    order_id INT NOT NULL,
+    item_id INT NOT NULL,
+    quantity INT NOT NULL CHECK (quantity > 0),
+    price_at_order DECIMAL(10,2) NOT NULL,
+    PRIMARY KEY (order_id, item_id),
+    CONSTRAINT fk_oi_order FOREIGN KEY (order_id)
+        REFERENCES Orders(order_id) ON DELETE CASCADE,
+    CONSTRAINT fk_oi_item FOREIGN KEY (item_id)
+        REFERENCES MenuItems(item_id) ON DELETE RESTRICT
+);
+
+CREATE TABLE IF NOT EXISTS AppSettings (
+    setting_key VARCHAR(64) PRIMARY KEY,
+    setting_value VARCHAR(255) NOT NULL
+);
+"""
 
-    def close(self) -> None:
+
+class DatabaseManager:
+
+    # tuples: immutable (callers get the shared value, not a copy) and ordered for the UI prompt
+    STATUS_FLOW: Dict[str, Tuple[str, ...]] = {
+        "RECEIVED":    ("IN_PROGRESS", "CANCELED"),
+        "IN_PROGRESS": ("READY", "CANCELED"),
+        "READY":       ("COMPLETED", "CANCELED"),
+        "COMPLETED":   (),
+        "CANCELED":    (),
+    }
+    # STATUS_FLOW inverted: which current statuses may move to the key (enforced in the UPDATE)
+    ALLOWED_PREV: Dict[str, Tuple[str, ...]] = _invert_flow(STATUS_FLOW)
+    # cancelable statuses as a bound IN list, shared by the single and bulk cancel
+    _SQL_CANCELABLE = "status_code IN (" + ",".join(["%s"] * len(ALLOWED_PREV["CANCELED"])) + ")"
+
+    # schema/migrations/bootstrap run once per process; later instances skip straight to work
+    _schema_ready: bool = False
+    # stored in AppSettings.schema_version after a full _ensure_schema pass; bump whenever
+    # _ensure_schema gains a table/column/index/view/seed so existing databases re-run it
+    SCHEMA_VERSION = 3
+    # information_schema hits, shared across instances; only positives are cached since
+    # columns/indexes are never dropped at runtime, so a miss is re-checked after a migration
+    _col_cache: Dict[Tuple[str, str], bool] = {}
+    _idx_cache: Dict[Tuple[str, str], bool] = {}
+    _has_service_type_col: bool = False
+
+    # lifecycle
+    def __init__(self):
+        self.current_user_id: Optional[int] = None
+        self._admin_code_hash: Optional[bytes] = None
+        # compared against when the username is unknown, so both login paths cost one bcrypt
+        self._dummy_hash: bytes = bcrypt.hashpw(b"x", bcrypt.gensalt(rounds=_BCRYPT_COST))
+        # bcrypt releases the GIL, so the *_async helpers hash in parallel on these threads
+        self._bc_pool = ThreadPoolExecutor(max_workers=int(os.getenv("BCRYPT_WORKERS", "4")))
+        # (sha256(secret), stored hash) -> monotonic time of the last successful check
+        self._verify_cache: Dict[Tuple[bytes, bytes], float] = {}
+        # get_menu_items results by (category_id, active_only) -> (expires at, rows); cleared by
+        # every menu/category write
+        self._menu_cache: Dict[
+            Tuple[Optional[int], bool], Tuple[float, Tuple[Tuple[int, str, float, int, bool], ...]]
+        ] = {}
+        # get_categories result as (expires at, rows); cleared by every category write
+        self._categories_cache: Optional[Tuple[float, Tuple[Tuple[int, str], ...]]] = None
+        # OrderStatusRef is seed data; read once, dropped via invalidate_status_cache()
+        self._status_cache: Optional[Tuple[str, ...]] = None
+        if not DatabaseManager._schema_ready:
+            with self._get_conn() as conn, conn.cursor(buffered=True) as cur:
+                if self._stored_schema_version(cur) == self.SCHEMA_VERSION:
+                    # up to date: every migration has run, so the column probe is known
+                    DatabaseManager._has_service_type_col = True
+                else:
+                    self._ensure_schema(conn, cur)
+                    cur.execute(
+                        "INSERT INTO AppSettings (setting_key, setting_value) VALUES ('schema_version', %s) "
+                        "ON DUPLICATE KEY UPDATE setting_value=VALUES(setting_value)",
+                        (str(self.SCHEMA_VERSION),),
+                    )
+                    conn.commit()
+            DatabaseManager._schema_ready = True
+
+    @contextmanager
+    def _get_conn(self) -> Iterator[PooledMySQLConnection]:
+        # the pool raises at once when exhausted; streaming iterators and worker threads can hold
+        # every connection for a moment, so wait a little instead of failing the UI action.
+        # Dropped idle connections are reconnected by the pool itself on checkout.
+        pool = _get_pool()
+        deadline = time.monotonic() + _POOL_WAIT
+        while True:
+            try:
+                conn = pool.get_connection()
+                break
+            except PoolError:
+                if time.monotonic() >= deadline:
+                    raise
+                time.sleep(0.02)
         try:
-            if getattr(self, "cur", None):
-                self.cur.close()
+            yield conn
         finally:
-            if getattr(self, "conn", None):
-                self.conn.close()
+            # never hand a connection back mid-transaction (stale snapshot for the next borrower)
+            try:
+                if conn.in_transaction:
+                    conn.rollback()
+            finally:
+                conn.close()
 
-    def __del__(self):
-        try:
-            self.close()
-        except Exception:
-            pass
+    def close(self) -> None:
+        # the connection pool is shared by every manager in the process, so only our own threads go
+        self._bc_pool.shutdown(wait=False)
 
     # helpers
-    def _column_exists(self, table: str, column: str) -> bool:
-        self.cur.execute(
+    def _column_exists(self, cur: MySQLCursor, table: str, column: str) -> bool:
+        key = (table, column)
+        if key in self._col_cache:
+            return True
+        cur.execute(
             """
             SELECT COUNT(*) FROM information_schema.columns
             WHERE table_schema = DATABASE() AND table_name=%s AND column_name=%s
             """,
             (table, column),
         )
-        return self.cur.fetchone()[0] > 0
-
-    def _index_exists(self, table: str, index_name: str) -> bool:
-        self.cur.execute(
+        found = cur.fetchone()[0] > 0
+        if found:
+            self._col_cache[key] = True
+        return found
+
+    def _index_exists(self, cur: MySQLCursor, table: str, index_name: str) -> bool:
+        key = (table, index_name)
+        if key in self._idx_cache:
+            return True
+        cur.execute(
             """
             SELECT COUNT(*) FROM information_schema.statistics
             WHERE table_schema = DATABASE() AND table_name=%s AND index_name=%s
             """,
             (table, index_name),
         )
-        return self.cur.fetchone()[0] > 0
-
-    def _create_index_if_missing(self, table: str, index_name: str, index_cols_sql: str) -> None:
-        if not self._index_exists(table, index_name):
-            self.cur.execute(f"CREATE INDEX {index_name} ON {table} {index_cols_sql}")
-            self.conn.commit()
+        found = cur.fetchone()[0] > 0
+        if found:
+            self._idx_cache[key] = True
+        return found
 
-    def _create_or_replace_view(self, name: str, select_sql: str) -> None:
-        self.cur.execute(f"DROP VIEW IF EXISTS {name}")
-        self.cur.execute(f"CREATE VIEW {name} AS {select_sql}")
-        self.conn.commit()
-
-    def _add_column_if_missing(self, table: str, column: str, ddl_sql: str) -> None:
-        if not self._column_exists(table, column):
-            self.cur.execute(f"ALTER TABLE {table} ADD COLUMN {ddl_sql}")
-            self.conn.commit()
-
-    # schema & migrations
-    def _ensure_schema(self) -> None:
-        # Users
-        self.cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS Users (
-                user_id INT PRIMARY KEY AUTO_INCREMENT,
-                username VARCHAR(50) NOT NULL UNIQUE,
-                password_hash VARCHAR(100) NOT NULL,
-                role ENUM('admin','user') NOT NULL
-            )
+    # DDL commits implicitly in MySQL, so the helpers below never call commit() themselves
+    def _create_index_if_missing(
+        self,
+        cur: MySQLCursor,
+        table: str,
+        index_name: str,
+        index_cols_sql: str,
+        fulltext: bool = False,
+    ) -> None:
+        if not self._index_exists(cur, table, index_name):
+            kind = "FULLTEXT INDEX" if fulltext else "INDEX"
+            cur.execute(f"CREATE {kind} {index_name} ON {table} {index_cols_sql}")
+
+    def _create_or_replace_view(self, cur: MySQLCursor, name: str, select_sql: str) -> None:
+        # rebuilt only when the definition changed or the view is gone: one probe instead of 2 DDL
+        key = f"view_{name}_hash"
+        defhash = hashlib.sha1(select_sql.encode()).hexdigest()
+        cur.execute(
             """
+            SELECT (SELECT setting_value FROM AppSettings WHERE setting_key=%s),
+                   (SELECT COUNT(*) FROM information_schema.views
+                    WHERE table_schema = DATABASE() AND table_name=%s)
+            """,
+            (key, name),
         )
-
-        # MenuCategories
-        self.cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS MenuCategories (
-                category_id INT PRIMARY KEY AUTO_INCREMENT,
-                name VARCHAR(60) NOT NULL UNIQUE
-            )
-            """
+        stored, present = cur.fetchone()
+        if stored == defhash and present:
+            return
+        # the upsert is committed implicitly by the DROP VIEW; if CREATE VIEW then fails,
+        # the missing view forces a rebuild next time despite the matching hash
+        cur.execute(
+            "INSERT INTO AppSettings (setting_key, setting_value) VALUES (%s,%s) "
+            "ON DUPLICATE KEY UPDATE setting_value=VALUES(setting_value)",
+            (key, defhash),
         )
+        cur.execute(f"DROP VIEW IF EXISTS {name}")
+        cur.execute(f"CREATE VIEW {name} AS {select_sql}")
 
-        # MenuItems
-        self.cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS MenuItems (
-                item_id INT PRIMARY KEY AUTO_INCREMENT,
-                category_id INT NOT NULL,
-                name VARCHAR(100) NOT NULL UNIQUE,
-                price DECIMAL(10,2) NOT NULL CHECK (price >= 0),
-                is_active TINYINT(1) NOT NULL DEFAULT 1,
-                CONSTRAINT fk_item_cat FOREIGN KEY (category_id)
-                    REFERENCES MenuCategories(category_id) ON DELETE RESTRICT
-            )
-            """
-        )
+    def _add_column_if_missing(self, cur: MySQLCursor, table: str, column: str, ddl_sql: str) -> None:
+        if not self._column_exists(cur, table, column):
+            cur.execute(f"ALTER TABLE {table} ADD COLUMN {ddl_sql}")
 
-        # Directory of statuses
-        self.cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS OrderStatusRef (
-                status_code VARCHAR(20) PRIMARY KEY,
-                sort_order INT NOT NULL
-            )
-            """
-        )
+    def refresh_schema_flags(self) -> None:
+        # re-probe after a migration applied outside this process; normally set once in _ensure_schema
+        self._col_cache.clear()
+        self._idx_cache.clear()
+        with self._get_conn() as conn, conn.cursor(buffered=True) as cur:
+            DatabaseManager._has_service_type_col = self._column_exists(cur, "Orders", "service_type")
 
-        # Orders
-        self.cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS Orders (
-                order_id INT PRIMARY KEY AUTO_INCREMENT,
-                customer_name VARCHAR(100),
-                customer_contact VARCHAR(100),
-                order_date DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
-                status_code VARCHAR(20) NOT NULL,
-                user_id INT,
-                notes VARCHAR(255),
-                service_type ENUM('DINE_IN','TAKEAWAY','DELIVERY') DEFAULT 'TAKEAWAY',
-                delivery_address VARCHAR(255) NULL,
-                CONSTRAINT fk_orders_user FOREIGN KEY (user_id)
-                    REFERENCES Users(user_id) ON DELETE SET NULL,
-                CONSTRAINT fk_orders_status FOREIGN KEY (status_code)
-                    REFERENCES OrderStatusRef(status_code) ON DELETE RESTRICT
-            )
-            """
-        )
-
-        # OrderItems
-        self.cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS OrderItems (
-                order_id INT NOT NULL,
-                item_id INT NOT NULL,
-                quantity INT NOT NULL CHECK (quantity > 0),
-                price_at_order DECIMAL(10,2) NOT NULL,
-                PRIMARY KEY (order_id, item_id),
-                CONSTRAINT fk_oi_order FOREIGN KEY (order_id)
-                    REFERENCES Orders(order_id) ON DELETE CASCADE,
-                CONSTRAINT fk_oi_item FOREIGN KEY (item_id)
-                    REFERENCES MenuItems(item_id) ON DELETE RESTRICT
-            )
-            """
-        )
+    # schema & migrations
+    def _stored_schema_version(self, cur: MySQLCursor) -> Optional[int]:
+        # one SELECT on a warm start; a fresh database has no AppSettings table yet
+        try:
+            cur.execute(_SQL_SETTING, ("schema_version",))
+            row = cur.fetchone()
+        except MySQLError as e:
+            if getattr(e, "errno", None) == 1146:
+                return None
+            raise
+        return int(row[0]) if row else None
 
-        # Settings
-        self.cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS AppSettings (
-                setting_key VARCHAR(64) PRIMARY KEY,
-                setting_value VARCHAR(255) NOT NULL
-            )
-            """
-        )
-        self.conn.commit()
+    def _ensure_schema(self, conn: PooledMySQLConnection, cur: MySQLCursor) -> None:
+        # one round-trip for all base tables; the generator must be drained to read every result
+        for _ in cur.execute(_SCHEMA_SQL, multi=True):
+            pass
 
         # MIGRATIONS
 
         # 1) Availability of the General category
-        self.cur.execute("SELECT category_id FROM MenuCategories WHERE name=%s", ("General",))
-        r = self.cur.fetchone()
+        cur.execute("SELECT category_id FROM MenuCategories WHERE name=%s", ("General",))
+        r = cur.fetchone()
         if r:
             general_id = int(r[0])
         else:
-            self.cur.execute("INSERT INTO MenuCategories(name) VALUES ('General')")
-            self.conn.commit()
-            general_id = int(self.cur.lastrowid)
+            cur.execute("INSERT INTO MenuCategories(name) VALUES ('General')")
+            conn.commit()
+            general_id = int(cur.lastrowid)
 
         # 2) MenuItems.category_id
-        if not self._column_exists("MenuItems", "category_id"):
-            self.cur.execute("ALTER TABLE MenuItems ADD COLUMN category_id INT NULL AFTER item_id")
-            self.cur.execute("UPDATE MenuItems SET category_id=%s WHERE category_id IS NULL", (general_id,))
-            self.conn.commit()
-            self.cur.execute("ALTER TABLE MenuItems MODIFY category_id INT NOT NULL")
+        if not self._column_exists(cur, "MenuItems", "category_id"):
+            cur.execute("ALTER TABLE MenuItems ADD COLUMN category_id INT NULL AFTER item_id")
+            cur.execute("UPDATE MenuItems SET category_id=%s WHERE category_id IS NULL", (general_id,))
+            # the ALTER below commits the backfill
+            cur.execute("ALTER TABLE MenuItems MODIFY category_id INT NOT NULL")
             try:
-                self.cur.execute(
+                cur.execute(
                     """
                     ALTER TABLE MenuItems
                     ADD CONSTRAINT fk_item_cat FOREIGN KEY (category_id)
@@ -212,17 +484,16 @@ class DatabaseManager:
                 )
             except MySQLError:
                 pass
-            self.conn.commit()
 
         # 3) MenuItems.is_active
-        self._add_column_if_missing("MenuItems", "is_active", "is_active TINYINT(1) NOT NULL DEFAULT 1 AFTER price")
+        self._add_column_if_missing(cur, "MenuItems", "is_active", "is_active TINYINT(1) NOT NULL DEFAULT 1 AFTER price")
 
         # 4) OrderItems.price_at_order
-        if not self._column_exists("OrderItems", "price_at_order"):
-            self.cur.execute(
+        if not self._column_exists(cur, "OrderItems", "price_at_order"):
+            cur.execute(
                 "ALTER TABLE OrderItems ADD COLUMN price_at_order DECIMAL(10,2) NOT NULL DEFAULT 0 AFTER quantity"
             )
-            self.cur.execute(
+            cur.execute(
                 """
                 UPDATE OrderItems oi
                 JOIN MenuItems mi ON mi.item_id = oi.item_id
@@ -230,15 +501,15 @@ class DatabaseManager:
                 WHERE oi.price_at_order = 0
                 """
             )
-            self.conn.commit()
+            conn.commit()
 
         # 5) Orders.status_code
-        if not self._column_exists("Orders", "status_code"):
-            self.cur.execute(
+        if not self._column_exists(cur, "Orders", "status_code"):
+            cur.execute(
                 "ALTER TABLE Orders ADD COLUMN status_code VARCHAR(20) NOT NULL DEFAULT 'RECEIVED' AFTER order_date"
             )
-            if self._column_exists("Orders", "status"):
-                self.cur.execute(
+            if self._column_exists(cur, "Orders", "status"):
+                cur.execute(
                     """
                     UPDATE Orders
                     SET status_code = CASE
@@ -250,30 +521,38 @@ class DatabaseManager:
                         ELSE 'RECEIVED' END
                     """
                 )
-            self.conn.commit()
+            conn.commit()
 
         # 6) Orders.notes
-        self._add_column_if_missing("Orders", "notes", "notes VARCHAR(255)")
+        self._add_column_if_missing(cur, "Orders", "notes", "notes VARCHAR(255)")
 
         # 7) Service type and delivery address
         self._add_column_if_missing(
+            cur,
             "Orders",
             "service_type",
             "service_type ENUM('DINE_IN','TAKEAWAY','DELIVERY') DEFAULT 'TAKEAWAY'",
         )
         self._add_column_if_missing(
+            cur,
             "Orders",
             "delivery_address",
             "delivery_address VARCHAR(255) NULL",
         )
-
-        self._bootstrap_admin()
-        self._bootstrap_statuses()
-        self._bootstrap_categories()
-        self._bootstrap_admin_access_code()
-        self._bootstrap_staff_access_codes()  # chef/courier codes
+        DatabaseManager._has_service_type_col = self._column_exists(cur, "Orders", "service_type")
+
+        # seed writes share one transaction; each bootstrap reports whether it wrote anything
+        seeded = [
+            self._bootstrap_admin(cur),
+            self._bootstrap_statuses(cur),
+            self._bootstrap_categories(cur),
+            self._bootstrap_access_codes(cur),  # admin/chef/courier codes
+        ]
+        if any(seeded):
+            conn.commit()
 
         self._create_or_replace_view(
+            cur,
             "v_order_totals",
             """
             SELECT o.order_id, COALESCE(SUM(oi.quantity * oi.price_at_order),0) AS total
@@ -282,102 +561,141 @@ class DatabaseManager:
             GROUP BY o.order_id
             """,
         )
-        self._create_index_if_missing("Orders", "idx_orders_status_date", "(status_code, order_date)")
-        self._create_index_if_missing("Orders", "idx_orders_user_date", "(user_id, order_date)")
-        self._create_index_if_missing("MenuItems", "idx_menuitems_active", "(is_active, category_id)")
+        self._create_index_if_missing(cur, "Orders", "idx_orders_status_date", "(status_code, order_date)")
+        self._create_index_if_missing(cur, "Orders", "idx_orders_user_date", "(user_id, order_date)")
+        self._create_index_if_missing(cur, "Orders", "idx_orders_order_date", "(order_date DESC)")
+        self._create_index_if_missing(cur, "MenuItems", "idx_menuitems_active", "(is_active, category_id)")
+        # covers the per-order total (order_id -> quantity * price_at_order) without the clustered row
+        self._create_index_if_missing(cur, "OrderItems", "idx_oi_cover", "(order_id, price_at_order, quantity)")
+        self._create_index_if_missing(
+            cur, "Orders", "ft_orders_search", "(customer_name, customer_contact, notes)", fulltext=True
+        )
+        # MATCH() needs an index on exactly its column list, so the courier search gets its own
+        self._create_index_if_missing(
+            cur,
+            "Orders",
+            "ft_orders_delivery_search",
+            "(customer_name, customer_contact, notes, delivery_address)",
+            fulltext=True,
+        )
+        # courier list: WHERE service_type='DELIVERY' [AND status_code=?] ORDER BY order_date DESC LIMIT n
+        self._create_index_if_missing(
+            cur, "Orders", "ix_orders_delivery", "(service_type, status_code, order_date DESC)"
+        )
 
     # bootstrap
-    def _bootstrap_admin(self) -> None:
-        self.cur.execute("SELECT COUNT(*) FROM Users WHERE role='admin'")
-        if self.cur.fetchone()[0] == 0:
-            default_pw = os.getenv("DEFAULT_ADMIN_PASSWORD", "admin")
-            pw_hash = bcrypt.hashpw(default_pw.encode(), bcrypt.gensalt()).decode()
-            self.cur.execute(
-                "INSERT INTO Users (username, password_hash, role) VALUES (%s,%s,%s)",
-                ("admin", pw_hash, "admin"),
-            )
-            self.conn.commit()
-            print("Seeded default admin (username='admin', password='admin'). Change it ASAP.")
-
-    def _bootstrap_statuses(self) -> None:
-        self.cur.execute("SELECT COUNT(*) FROM OrderStatusRef")
-        if self.cur.fetchone()[0] == 0:
-            rows = [
-                ("RECEIVED", 1),
-                ("IN_PROGRESS", 2),
-                ("READY", 3),
-                ("COMPLETED", 4),
-                ("CANCELED", 5),
-            ]
-            self.cur.executemany("INSERT INTO OrderStatusRef (status_code, sort_order) VALUES (%s,%s)", rows)
-            self.conn.commit()
-
-    def _bootstrap_categories(self) -> None:
-        self.cur.execute("SELECT COUNT(*) FROM MenuCategories")
-        if self.cur.fetchone()[0] == 0:
-            self.cur.executemany(
-                "INSERT INTO MenuCategories (name) VALUES (%s)",
-                [("Mains",), ("Drinks",), ("Desserts",)],
-            )
-            self.conn.commit()
-
-    def _bootstrap_admin_access_code(self) -> None:
-        self.cur.execute("SELECT setting_value FROM AppSettings WHERE setting_key='admin_access_code_hash'")
-        row = self.cur.fetchone()
-        if not row:
-            raw = os.getenv("ADMIN_ACCESS_CODE", "ADMIN123")
-            hashed = bcrypt.hashpw(raw.encode(), bcrypt.gensalt()).decode()
-            self.cur.execute(
-                "INSERT INTO AppSettings (setting_key, setting_value) VALUES ('admin_access_code_hash', %s)",
-                (hashed,),
-            )
-            self.conn.commit()
-
-    def _bootstrap_staff_access_codes(self) -> None:
-        # CHEF
-        self.cur.execute("SELECT setting_value FROM AppSettings WHERE setting_key='chef_access_code_hash'")
-        if not self.cur.fetchone():
-            raw = os.getenv("CHEF_ACCESS_CODE", "CHEF123")
-            hashed = bcrypt.hashpw(raw.encode(), bcrypt.gensalt()).decode()
-            self.cur.execute(
-                "INSERT INTO AppSettings (setting_key, setting_value) VALUES ('chef_access_code_hash', %s)",
-                (hashed,),
+    def _bootstrap_admin(self, cur: MySQLCursor) -> bool:
+        cur.execute("SELECT COUNT(*) FROM Users WHERE role='admin'")
+        if cur.fetchone()[0] != 0:
+            return False
+        default_pw = os.getenv("DEFAULT_ADMIN_PASSWORD", "admin")
+        pw_hash = bcrypt.hashpw(default_pw.encode(), bcrypt.gensalt(rounds=_BCRYPT_COST)).decode()
+        cur.execute(_SQL_INSERT_USER, ("admin", pw_hash, "admin"))
+        print("Seeded default admin (username='admin', password='admin'). Change it ASAP.")
+        return True
+
+    def _bootstrap_statuses(self, cur: MySQLCursor) -> bool:
+        # single idempotent write (executemany folds it into one multi-row INSERT); also
+        # restores any status row that went missing
+        rows = [
+            ("RECEIVED", 1),
+            ("IN_PROGRESS", 2),
+            ("READY", 3),
+            ("COMPLETED", 4),
+            ("CANCELED", 5),
+        ]
+        cur.executemany("INSERT IGNORE INTO OrderStatusRef (status_code, sort_order) VALUES (%s,%s)", rows)
+        return cur.rowcount > 0
+
+    def _bootstrap_categories(self, cur: MySQLCursor) -> bool:
+        # seed only an empty table (user-deleted defaults stay deleted), guard evaluated server-side
+        cur.execute(
+            """
+            INSERT INTO MenuCategories (name)
+            SELECT d.name FROM (SELECT 'Mains' AS name UNION ALL SELECT 'Drinks' UNION ALL SELECT 'Desserts') d
+            WHERE NOT EXISTS (SELECT 1 FROM MenuCategories)
+            """
+        )
+        return cur.rowcount > 0
+
+    def _bootstrap_access_codes(self, cur: MySQLCursor) -> bool:
+        # one SELECT for all role codes; only the missing ones are hashed and inserted
+        keys = tuple(_ACCESS_CODE_DEFAULTS)
+        cur.execute(
+            "SELECT setting_key, setting_value FROM AppSettings WHERE setting_key IN ("
+            + ",".join(["%s"] * len(keys)) + ")",
+            keys,
+        )
+        present = {k: v for k, v in cur.fetchall()}
+        missing = [k for k in keys if k not in present]
+        if missing:
+            # independent CPU-bound hashes; bcrypt drops the GIL so they run side by side
+            raws = [os.getenv(*_ACCESS_CODE_DEFAULTS[k]).encode() for k in missing]
+            hashed = list(
+                self._bc_pool.map(lambda raw: bcrypt.hashpw(raw, bcrypt.gensalt(rounds=_BCRYPT_COST)).decode(), raws)
             )
-            self.conn.commit()
-        # COURIER
-        self.cur.execute("SELECT setting_value FROM AppSettings WHERE setting_key='courier_access_code_hash'")
-        if not self.cur.fetchone():
-            raw = os.getenv("COURIER_ACCESS_CODE", "COURIER123")
-            hashed = bcrypt.hashpw(raw.encode(), bcrypt.gensalt()).decode()
-            self.cur.execute(
-                "INSERT INTO AppSettings (setting_key, setting_value) VALUES ('courier_access_code_hash', %s)",
-                (hashed,),
+            cur.executemany(
+                "INSERT INTO AppSettings (setting_key, setting_value) VALUES (%s,%s)",
+                list(zip(missing, hashed)),
             )
-            self.conn.commit()
+            present.update(zip(missing, hashed))
+        self._admin_code_hash = present["admin_access_code_hash"].encode()
+        return bool(missing)
 
     # auth/users
+    def _checkpw(self, secret: str, pw_hash: bytes) -> bool:
+        # repeat successes within the TTL skip bcrypt; the stored hash is part of the key,
+        # so a changed password/code (new salt) never hits an old entry. Failures are not cached.
+        key = (hashlib.sha256(secret.encode()).digest(), pw_hash)
+        now = time.monotonic()
+        if now - self._verify_cache.get(key, float("-inf")) < _VERIFY_TTL:
+            return True
+        if not bcrypt.checkpw(secret.encode(), pw_hash):
+            return False
+        if _VERIFY_TTL > 0:
+            if len(self._verify_cache) >= 64:
+                self._verify_cache = {k: t for k, t in self._verify_cache.items() if now - t < _VERIFY_TTL}
+            self._verify_cache[key] = now
+        return True
+
+    def _fetch_user(self, username: str) -> Optional[Tuple[int, str, str, str]]:
+        with self._get_conn() as conn, conn.cursor(buffered=True) as cur:
+            cur.execute(_SQL_AUTH_USER, (username,))
+            return cur.fetchone()
+
     def authenticate_user(self, username: str, password: str) -> Optional[Tuple[int, str, str]]:
-        self.cur.execute(
-            "SELECT user_id, username, password_hash, role FROM Users WHERE username=%s",
-            (username,),
-        )
-        row = self.cur.fetchone
-        if callable(row):
-            row = row()
+        row = self._fetch_user(username)
         if not row:
+            bcrypt.checkpw(password.encode(), self._dummy_hash)
             return None
         user_id, uname, pw_hash, role = row
-        if bcrypt.checkpw(password.encode(), pw_hash.encode()):
+        if self._checkpw(password, pw_hash.encode()):
             return int(user_id), uname, role
         return None
 
+    def _bcrypt_check_async(self, secret: str, pw_hash: bytes) -> "asyncio.Future[bool]":
+        # awaitable bcrypt compare on the bcrypt threads, keeps the event loop/UI thread free
+        return asyncio.get_running_loop().run_in_executor(self._bc_pool, self._checkpw, secret, pw_hash)
+
+    async def authenticate_user_async(self, username: str, password: str) -> Optional[Tuple[int, str, str]]:
+        loop = asyncio.get_running_loop()
+        row = await loop.run_in_executor(None, self._fetch_user, username)
+        if not row:
+            await self._bcrypt_check_async(password, self._dummy_hash)
+            return None
+        ok = await self._bcrypt_check_async(password, row[2].encode())
+        if not ok:
+            return None
+        return int(row[0]), row[1], row[3]
+
     def authenticate_admin_password(self, password: str) -> Optional[Tuple[int, str, str]]:
-        self.cur.execute("SELECT user_id, password_hash FROM Users WHERE role='admin' ORDER BY user_id LIMIT 1")
-        row = self.cur.fetchone()
+        with self._get_conn() as conn, conn.cursor(buffered=True) as cur:
+            cur.execute(_SQL_AUTH_ADMIN)
+            row = cur.fetchone()
         if not row:
             return None
         uid, pw_hash = int(row[0]), row[1]
-        if bcrypt.checkpw(password.encode(), pw_hash.encode()):
+        if self._checkpw(password, pw_hash.encode()):
             return uid, "admin", "admin"
         return None
 
@@ -387,38 +705,59 @@ class DatabaseManager:
     def create_user(self, username: str, password: str, role: str = "user") -> int:
         if role == "admin":
             raise ValueError("Creating additional admins is not allowed.")
-        pw_hash = bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
-        try:
-            self.cur.execute(
-                "INSERT INTO Users (username, password_hash, role) VALUES (%s,%s,%s)",
-                (username, pw_hash, role),
-            )
-            self.conn.commit()
-            return int(self.cur.lastrowid)
-        except IntegrityError as e:
-            if getattr(e, "errno", None) == 1062:
-                raise ValueError("USERNAME_TAKEN")
-            raise
+        pw_hash = bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=_BCRYPT_COST)).decode()
+        return self._insert_user(username, pw_hash, role)
+
+    async def create_user_async(self, username: str, password: str, role: str = "user") -> int:
+        if role == "admin":
+            raise ValueError("Creating additional admins is not allowed.")
+        loop = asyncio.get_running_loop()
+        salt = bcrypt.gensalt(rounds=_BCRYPT_COST)
+        pw_hash = (await loop.run_in_executor(self._bc_pool, bcrypt.hashpw, password.encode(), salt)).decode()
+        return await loop.run_in_executor(None, self._insert_user, username, pw_hash, role)
+
+    def _insert_user(self, username: str, pw_hash: str, role: str) -> int:
+        with self._get_conn() as conn, conn.cursor(buffered=True) as cur:
+            try:
+                cur.execute(_SQL_INSERT_USER, (username, pw_hash, role))
+                conn.commit()
+                return int(cur.lastrowid)
+            except IntegrityError as e:
+                if getattr(e, "errno", None) == 1062:
+                    raise ValueError("USERNAME_TAKEN")
+                raise
 
     def change_user_password(self, user_id: int, old_password: str, new_password: str) -> None:
-        self.cur.execute("SELECT password_hash FROM Users WHERE user_id=%s", (int(user_id),))
-        row = self.cur.fetchone()
-        if not row:
-            raise ValueError("NO_SUCH_USER")
-        if not bcrypt.checkpw(old_password.encode(), row[0].encode()):
-            raise ValueError("WRONG_OLD_PASSWORD")
-        new_hash = bcrypt.hashpw(new_password.encode(), bcrypt.gensalt()).decode()
-        self.cur.execute("UPDATE Users SET password_hash=%s WHERE user_id=%s", (new_hash, int(user_id)))
-        self.conn.commit()
+        with self._get_conn() as conn, conn.cursor(buffered=True) as cur:
+            cur.execute(_SQL_USER_PW_HASH, (user_id,))
+            row = cur.fetchone()
+            if not row:
+                raise ValueError("NO_SUCH_USER")
+            if not bcrypt.checkpw(old_password.encode(), row[0].encode()):
+                raise ValueError("WRONG_OLD_PASSWORD")
+            new_hash = bcrypt.hashpw(new_password.encode(), bcrypt.gensalt(rounds=_BCRYPT_COST)).decode()
+            cur.execute(_SQL_UPDATE_USER_PW, (new_hash, user_id))
+            conn.commit()
 
     # role access codes
     def _verify_code_by_key(self, key: str, code: str) -> bool:
-        self.cur.execute("SELECT setting_value FROM AppSettings WHERE setting_key=%s", (key,))
-        row = self.cur.fetchone()
-        return bool(row and bcrypt.checkpw(code.encode(), row[0].encode()))
+        with self._get_conn() as conn, conn.cursor(buffered=True) as cur:
+            cur.execute(_SQL_SETTING, (key,))
+            row = cur.fetchone()
+        return bool(row and self._checkpw(code, row[0].encode()))
+
+    def _load_admin_hash(self) -> Optional[bytes]:
+        # cache miss only (row edited/created outside this process before first check)
+        with self._get_conn() as conn, conn.cursor(buffered=True) as cur:
+            cur.execute(_SQL_SETTING, ("admin_access_code_hash",))
+            row = cur.fetchone()
+        self._admin_code_hash = row[0].encode() if row else None
+        return self._admin_code_hash
 
     def verify_admin_access(self, code: str) -> bool:
-        return self._verify_code_by_key("admin_access_code_hash", code)
+        # hash is cached at bootstrap/change time; only the bcrypt compare runs per check
+        h = self._admin_code_hash or self._load_admin_hash()
+        return bool(h and self._checkpw(code, h))
 
     def verify_chef_access(self, code: str) -> bool:
         return self._verify_code_by_key("chef_access_code_hash", code)
@@ -429,99 +768,141 @@ class DatabaseManager:
     def change_admin_access_code(self, requester_role: str, new_code: str) -> None:
         if requester_role != "admin":
             raise PermissionError("Only admin can change the access code.")
-        new_hash = bcrypt.hashpw(new_code.encode(), bcrypt.gensalt()).decode()
-        self.cur.execute(
-            "UPDATE AppSettings SET setting_value=%s WHERE setting_key='admin_access_code_hash'",
-            (new_hash,),
-        )
-        self.conn.commit()
+        new_hash = bcrypt.hashpw(new_code.encode(), bcrypt.gensalt(rounds=_BCRYPT_COST)).decode()
+        with self._get_conn() as conn, conn.cursor(buffered=True) as cur:
+            cur.execute(_SQL_UPDATE_SETTING, (new_hash, "admin_access_code_hash"))
+            conn.commit()
+        self._admin_code_hash = new_hash.encode()
 
     # categories
     def get_categories(self) -> List[Tuple[int, str]]:
-        self.cur.execute("SELECT category_id, name FROM MenuCategories ORDER BY name")
-        return [(int(r[0]), r[1]) for r in self.cur.fetchall()]
+        now = time.monotonic()
+        cached = self._categories_cache
+        if cached is None or cached[0] <= now:
+            with self._get_conn() as conn, conn.cursor(buffered=True) as cur:
+                cur.execute(_SQL_CATEGORIES)
+                # INT PK already arrives as int
+                cached = self._categories_cache = (now + _MENU_CACHE_TTL, tuple(cur.fetchall()))
+        return list(cached[1])
 
     def add_category(self, name: str) -> int:
-        try:
-            self.cur.execute("INSERT INTO MenuCategories (name) VALUES (%s)", (name,))
-            self.conn.commit()
-            return int(self.cur.lastrowid)
-        except IntegrityError as e:
-            if getattr(e, "errno", None) == 1062:
-                raise ValueError("CATEGORY_EXISTS")
-            raise
+        with self._get_conn() as conn, conn.cursor(buffered=True) as cur:
+            try:
+                cur.execute(_SQL_INSERT_CATEGORY, (name,))
+                conn.commit()
+                self._menu_cache.clear()
+                self._categories_cache = None
+                return int(cur.lastrowid)
+            except IntegrityError as e:
+                if getattr(e, "errno", None) == 1062:
+                    raise ValueError("CATEGORY_EXISTS")
+                raise
+
+    def get_or_create_category(self, name: str) -> int:
+        # one statement either way; an existing category is returned as-is
+        with self._get_conn() as conn, conn.cursor(buffered=True) as cur:
+            cur.execute(_SQL_GET_OR_CREATE_CATEGORY, (name,))
+            conn.commit()
+            self._menu_cache.clear()
+            self._categories_cache = None
+            return int(cur.lastrowid)
 
     def delete_category(self, category_id: int) -> None:
-        try:
-            self.cur.execute("DELETE FROM MenuCategories WHERE category_id=%s", (int(category_id),))
-            self.conn.commit()
-        except MySQLError as e:
-            if getattr(e, "errno", None) == 1451:
-                raise ValueError("CATEGORY_IN_USE")
-            raise
+        with self._get_conn() as conn, conn.cursor(buffered=True) as cur:
+            try:
+                cur.execute(_SQL_DELETE_CATEGORY, (category_id,))
+                conn.commit()
+                self._menu_cache.clear()
+                self._categories_cache = None
+            except MySQLError as e:
+                if getattr(e, "errno", None) == 1451:
+                    raise ValueError("CATEGORY_IN_USE")
+                raise
 
     # menu
     def get_menu_items(
         self, category_id: Optional[int] = None, active_only: bool = True
     ) -> List[Tuple[int, str, float, int, bool]]:
-        sql = "SELECT item_id, name, price, category_id, is_active FROM MenuItems WHERE 1=1"
+        key = (category_id, active_only)
+        now = time.monotonic()
+        cached = self._menu_cache.get(key)
+        if cached is not None and cached[0] > now:
+            return list(cached[1])
+        sql = _SQL_MENU_ITEMS
         params: List[Union[int, str]] = []
         if category_id is not None:
             sql += " AND category_id=%s"
-            params.append(int(category_id))
+            params.append(category_id)
         if active_only:
             sql += " AND is_active=1"
         sql += " ORDER BY name"
-        self.cur.execute(sql, tuple(params))
-        rows = self.cur.fetchall()
-        return [(int(r[0]), r[1], float(r[2]), int(r[3]), bool(r[4])) for r in rows]
+        with self._get_conn() as conn, conn.cursor(buffered=True) as cur:
+            cur.execute(sql, tuple(params))
+            # INT columns already arrive as int; only DECIMAL price and TINYINT flag need converting
+            rows = tuple((iid, name, float(price), cat, bool(active)) for iid, name, price, cat, active in cur)
+        self._menu_cache[key] = (now + _MENU_CACHE_TTL, rows)
+        return list(rows)
 
     def add_menu_item(self, name: str, price: float, category_id: int, is_active: bool = True) -> int:
-        try:
-            self.cur.execute(
-                "INSERT INTO MenuItems (name, price, category_id, is_active) VALUES (%s,%s,%s,%s)",
-                (name, price, int(category_id), 1 if is_active else 0),
-            )
-            self.conn.commit()
-            return int(self.cur.lastrowid)
-        except IntegrityError as e:
-            if getattr(e, "errno", None) == 1062:
-                raise ValueError("NAME_TAKEN")
-            raise
+        with self._get_conn() as conn, conn.cursor(buffered=True) as cur:
+            try:
+                cur.execute(_SQL_INSERT_MENU_ITEM, (name, price, category_id, is_active))
+                conn.commit()
+                self._menu_cache.clear()
+                return int(cur.lastrowid)
+            except IntegrityError as e:
+                if getattr(e, "errno", None) == 1062:
+                    raise ValueError("NAME_TAKEN")
+                raise
+
+    def get_or_create_menu_item(self, name: str, price: float, category_id: int, is_active: bool = True) -> int:
+        # an existing item (matched by its unique name) is returned unchanged, price/category untouched
+        with self._get_conn() as conn, conn.cursor(buffered=True) as cur:
+            cur.execute(_SQL_GET_OR_CREATE_MENU_ITEM, (name, price, category_id, is_active))
+            conn.commit()
+            self._menu_cache.clear()
+            return int(cur.lastrowid)
 
     def update_menu_item(self, item_id: int, new_name: str, new_price: float, new_category_id: int, is_active: bool) -> None:
-        try:
-            self.cur.execute(
-                "UPDATE MenuItems SET name=%s, price=%s, category_id=%s, is_active=%s WHERE item_id=%s",
-                (new_name, new_price, int(new_category_id), 1 if is_active else 0, int(item_id)),
-            )
-            self.conn.commit()
-        except IntegrityError as e:
-            if getattr(e, "errno", None) == 1062:
-                raise ValueError("NAME_TAKEN")
-            raise
+        with self._get_conn() as conn, conn.cursor(buffered=True) as cur:
+            try:
+                cur.execute(
+                    _SQL_UPDATE_MENU_ITEM,
+                    (new_name, new_price, new_category_id, is_active, item_id),
+                )
+                conn.commit()
+                self._menu_cache.clear()
+            except IntegrityError as e:
+                if getattr(e, "errno", None) == 1062:
+                    raise ValueError("NAME_TAKEN")
+                raise
 
     def delete_menu_item_by_id(self, item_id: int) -> None:
-        try:
-            self.cur.execute("DELETE FROM MenuItems WHERE item_id=%s", (int(item_id),))
-            self.conn.commit()
-        except MySQLError as e:
-            if getattr(e, "errno", None) == 1451:
-                raise ValueError("ITEM_IN_USE")
-            raise
+        with self._get_conn() as conn, conn.cursor(buffered=True) as cur:
+            try:
+                cur.execute(_SQL_DELETE_MENU_ITEM_BY_ID, (item_id,))
+                conn.commit()
+                self._menu_cache.clear()
+            except MySQLError as e:
+                if getattr(e, "errno", None) == 1451:
+                    raise ValueError("ITEM_IN_USE")
+                raise
 
     def delete_menu_item_by_name(self, name: str) -> None:
-        try:
-            self.cur.execute("DELETE FROM MenuItems WHERE name=%s", (name,))
-            self.conn.commit()
-        except MySQLError as e:
-            if getattr(e, "errno", None) == 1451:
-                raise ValueError("ITEM_IN_USE")
-            raise
+        with self._get_conn() as conn, conn.cursor(buffered=True) as cur:
+            try:
+                cur.execute(_SQL_DELETE_MENU_ITEM_BY_NAME, (name,))
+                conn.commit()
+                self._menu_cache.clear()
+            except MySQLError as e:
+                if getattr(e, "errno", None) == 1451:
+                    raise ValueError("ITEM_IN_USE")
+                raise
 
     def get_item_id_by_name(self, name: str) -> Optional[int]:
-        self.cur.execute("SELECT item_id FROM MenuItems WHERE name=%s LIMIT 1", (name,))
-        r = self.cur.fetchone()
+        with self._get_conn() as conn, conn.cursor(buffered=True) as cur:
+            cur.execute(_SQL_ITEM_ID_BY_NAME, (name,))
+            r = cur.fetchone()
         return int(r[0]) if r else None
 
     # orders
@@ -538,88 +919,111 @@ class DatabaseManager:
             raise RuntimeError("No current user set before creating orders.")
 
         stype = service_type or "TAKEAWAY"
-        if not self._column_exists("Orders", "service_type"):
-            extra = f" | Service: {stype}"
-            if delivery_address:
-                extra += f" | Delivery address: {delivery_address}"
-            notes = (notes or "") + extra
-            self.cur.execute(
-                """
-                INSERT INTO Orders (customer_name, customer_contact, order_date, status_code, user_id, notes)
-                VALUES (%s,%s,NOW(),%s,%s,%s)
-                """,
-                (customer_name, customer_contact, "RECEIVED", self.current_user_id, notes),
-            )
-        else:
-            self.cur.execute(
-                """
-                INSERT INTO Orders (customer_name, customer_contact, order_date, status_code, user_id, notes, service_type, delivery_address)
-                VALUES (%s,%s,NOW(),%s,%s,%s,%s,%s)
-                """,
-                (customer_name, customer_contact, "RECEIVED", self.current_user_id, notes, stype, delivery_address),
-            )
+        # autocommit is off, so header + lines form one implicit transaction with a single
+        # commit below; any exception leaves it open and _get_conn rolls it back
+        with self._get_conn() as conn, conn.cursor(buffered=True) as cur:
+            if not self._has_service_type_col:
+                extra = f" | Service: {stype}"
+                if delivery_address:
+                    extra += f" | Delivery address: {delivery_address}"
+                notes = (notes or "") + extra
+                cur.execute(
+                    _SQL_INSERT_ORDER_LEGACY,
+                    (customer_name, customer_contact, "RECEIVED", self.current_user_id, notes),
+                )
+            else:
+                cur.execute(
+                    _SQL_INSERT_ORDER,
+                    (customer_name, customer_contact, "RECEIVED", self.current_user_id, notes, stype, delivery_address),
+                )
 
-        order_id = int(self.cur.lastrowid)
+            order_id = int(cur.lastrowid)
+            self._insert_order_items(cur, order_id, items)
+            conn.commit()
+        return order_id
 
+    def _insert_order_items(self, cur: MySQLCursor, order_id: int, items: Sequence[Tuple[int, int]]) -> None:
+        # one price lookup + one multi-row INSERT instead of two round-trips per line. Repeated
+        # items are merged first: (order_id, item_id) is the PK, and it means fewer rows to write
+        merged: Dict[int, int] = {}
         for item_id, qty in items:
-            self.cur.execute("SELECT price FROM MenuItems WHERE item_id=%s", (int(item_id),))
-            row = self.cur.fetchone()
-            if not row:
+            merged[item_id] = merged.get(item_id, 0) + qty
+        items = list(merged.items())
+        item_ids = merged.keys()
+        if not item_ids:
+            return
+        cur.execute(
+            "SELECT item_id, price FROM MenuItems WHERE item_id IN (" + ",".join(["%s"] * len(item_ids)) + ")",
+            tuple(item_ids),
+        )
+        prices = dict(cur.fetchall())
+        rows = []
+        for item_id, qty in items:
+            price = prices.get(item_id)
+            if price is None:
                 raise ValueError(f"Menu item {item_id} not found")
-            price = float(row[0])
-            self.cur.execute(
-                "INSERT INTO OrderItems (order_id, item_id, quantity, price_at_order) VALUES (%s,%s,%s,%s)",
-                (order_id, int(item_id), int(qty), price),
-            )
-
-        self.conn.commit()
-        return order_id
+            rows.append((order_id, item_id, qty, price))
+        cur.executemany(_SQL_INSERT_ORDER_ITEM, rows)
 
     def replace_order_items(self, order_id: int, items: Sequence[Tuple[int, int]], requester_user_id: int) -> None:
-        self.cur.execute("SELECT user_id, status_code FROM Orders WHERE order_id=%s", (int(order_id),))
-        row = self.cur.fetchone()
-        if not row:
-            raise ValueError("ORDER_NOT_FOUND")
-        owner_id, status_code = (int(row[0]) if row[0] is not None else None), row[1]
-        if owner_id != int(requester_user_id):
-            raise PermissionError("You can edit only your own orders.")
-        if status_code != "RECEIVED":
-            raise ValueError("ONLY_RECEIVED_EDITABLE")
-
-        self.cur.execute("DELETE FROM OrderItems WHERE order_id=%s", (int(order_id),))
-        for item_id, qty in items:
-            self.cur.execute("SELECT price FROM MenuItems WHERE item_id=%s", (int(item_id),))
-            r = self.cur.fetchone()
-            if not r:
-                raise ValueError(f"Menu item {item_id} not found")
-            price = float(r[0])
-            self.cur.execute(
-                "INSERT INTO OrderItems (order_id, item_id, quantity, price_at_order) VALUES (%s,%s,%s,%s)",
-                (int(order_id), int(item_id), int(qty), price),
+        with self._get_conn() as conn, conn.cursor(buffered=True) as cur:
+            cur.execute(_SQL_ORDER_OWNER_STATUS, (order_id,))
+            row = cur.fetchone()
+            if not row:
+                raise ValueError("ORDER_NOT_FOUND")
+            owner_id, status_code = row
+            if owner_id != requester_user_id:
+                raise PermissionError("You can edit only your own orders.")
+            if status_code != "RECEIVED":
+                raise ValueError("ONLY_RECEIVED_EDITABLE")
+
+            cur.execute(_SQL_DELETE_ORDER_ITEMS, (order_id,))
+            self._insert_order_items(cur, order_id, items)
+            conn.commit()
+
+    def _order_search(
+        self, search_text: str, cols: Tuple[str, ...] = _ORDER_SEARCH_COLS
+    ) -> Tuple[str, List[str]]:
+        # FULLTEXT (ft_orders_search / ft_orders_delivery_search, one per column list) when every
+        # word is long enough to be indexed (InnoDB min token size 3): words split like the
+        # FULLTEXT parser does, each one a required prefix term, so boolean operators in user
+        # input are dropped. Anything shorter keeps the old substring LIKE scan.
+        words = re.findall(r"\w+", search_text)
+        if words and all(len(w) >= 3 for w in words):
+            return (
+                f" AND MATCH({', '.join(cols)}) AGAINST (%s IN BOOLEAN MODE)",
+                [" ".join(f"+{w}*" for w in words)],
             )
-        self.conn.commit()
-
-    def get_orders(self, status: Optional[str] = None, search_text: str = "", limit: int = 200) -> List[OrderRow]:
-        sql = """
-        SELECT o.order_id, DATE_FORMAT(o.order_date, '%Y-%m-%d %H:%i'),
-               COALESCE(o.customer_name,''), o.status_code, COALESCE(v.total,0)
-        FROM Orders o
-        LEFT JOIN v_order_totals v ON v.order_id = o.order_id
-        WHERE 1=1
-        """
+        # callers skip blank input entirely, so there is never a bare '%%' pattern (a full scan
+        # that also drops rows whose searched columns are all NULL)
+        like = f"%{search_text.strip()}%"
+        return " AND (" + " OR ".join(f"{c} LIKE %s" for c in cols) + ")", [like] * len(cols)
+
+    def get_orders(
+        self,
+        status: Optional[str] = None,
+        search_text: str = "",
+        limit: int = 200,
+        after_id: Optional[int] = None,
+    ) -> List[OrderRow]:
+        # after_id: the last order_id already shown; returns the page that follows it
+        sql = _SQL_ORDER_LIST + "WHERE 1=1"
         params: List[Union[str, int]] = []
         if status:
             sql += " AND o.status_code=%s"
             params.append(status)
-        if search_text:
-            like = f"%{search_text.strip()}%"
-            sql += " AND (o.customer_name LIKE %s OR o.customer_contact LIKE %s OR o.notes LIKE %s)"
-            params += [like, like, like]
-        sql += " ORDER BY o.order_date DESC LIMIT %s"
-        params.append(int(limit))
-        self.cur.execute(sql, tuple(params))
-        rows = self.cur.fetchall()
-        return [(int(r[0]), r[1], r[2], r[3], float(r[4])) for r in rows]
+        if search_text and not search_text.isspace():
+            clause, args = self._order_search(search_text)
+            sql += clause
+            params += args
+        if after_id is not None:
+            sql += _SQL_SEEK_BEFORE
+            params.append(after_id)
+        sql += _SQL_NEWEST_FIRST
+        params.append(limit)
+        with self._get_conn() as conn, conn.cursor(buffered=True) as cur:
+            cur.execute(sql, tuple(params))
+            return cur.fetchall()
 
     def get_orders_for_user(
         self,
@@ -627,79 +1031,136 @@ class DatabaseManager:
         status: Optional[str] = None,
         search_text: str = "",
         limit: int = 400,
+        after_id: Optional[int] = None,
     ) -> List[OrderRow]:
-        sql = """
-        SELECT o.order_id, DATE_FORMAT(o.order_date, '%Y-%m-%d %H:%i'),
-               COALESCE(o.customer_name,''), o.status_code, COALESCE(v.total,0)
-        FROM Orders o
-        LEFT JOIN v_order_totals v ON v.order_id = o.order_id
-        WHERE o.user_id=%s
-        """
-        params: List[Union[str, int]] = [int(user_id)]
+        sql = _SQL_ORDER_LIST + "WHERE o.user_id=%s"
+        params: List[Union[str, int]] = [user_id]
         if status:
             sql += " AND o.status_code=%s"
             params.append(status)
-        if search_text:
-            like = f"%{search_text.strip()}%"
-            sql += " AND (o.customer_name LIKE %s OR o.customer_contact LIKE %s OR o.notes LIKE %s)"
-            params += [like, like, like]
-        sql += " ORDER BY o.order_date DESC LIMIT %s"
-        params.append(int(limit))
-        self.cur.execute(sql, tuple(params))
-        rows = self.cur.fetchall()
-        return [(int(r[0]), r[1], r[2], r[3], float(r[4])) for r in rows]
-
-    def get_all_orders(self) -> List[Tuple[int, str, str]]:
-        self.cur.execute("SELECT order_id, customer_name, status_code FROM Orders ORDER BY order_date DESC")
-        return [(int(r[0]), r[1] or "", r[2]) for r in self.cur.fetchall()]
-
-    def get_order_items(self, order_id: Union[int, str]) -> Tuple[List[Tuple[str, int, float, float]], float]:
-        self.cur.execute(
-            """
-            SELECT mi.name, oi.quantity, oi.price_at_order, (oi.quantity * oi.price_at_order) AS subtotal
-            FROM OrderItems oi
-            JOIN MenuItems mi ON mi.item_id = oi.item_id
-            WHERE oi.order_id=%s
-            ORDER BY mi.name
-            """,
-            (int(order_id),),
-        )
-        rows = self.cur.fetchall()
-        items = [(r[0], int(r[1]), float(r[2]), float(r[3])) for r in rows]
-        total = sum(x[3] for x in items)
+        if search_text and not search_text.isspace():
+            clause, args = self._order_search(search_text)
+            sql += clause
+            params += args
+        if after_id is not None:
+            sql += _SQL_SEEK_BEFORE
+            params.append(after_id)
+        sql += _SQL_NEWEST_FIRST
+        params.append(limit)
+        with self._get_conn() as conn, conn.cursor(buffered=True) as cur:
+            cur.execute(sql, tuple(params))
+            return cur.fetchall()
+
+    def get_all_orders(self, limit: int = 100, before_id: Optional[int] = None) -> List[Tuple[int, str, str]]:
+        # keyset pagination: pass the last order_id of the previous page as before_id
+        sql = "SELECT order_id, customer_name, status_code FROM Orders"
+        params: List[int] = []
+        if before_id is not None:
+            sql += " WHERE order_id < %s"
+            params.append(before_id)
+        sql += " ORDER BY order_id DESC LIMIT %s"
+        params.append(limit)
+        with self._get_conn() as conn, conn.cursor(buffered=True) as cur:
+            cur.execute(sql, tuple(params))
+            return [(oid, cust or "", st) for oid, cust, st in cur]
+
+    def iter_all_orders(self) -> Iterator[Tuple[int, str, str]]:
+        # unbuffered cursor: rows come off the socket as they are consumed, so memory stays flat
+        # however many orders exist. The pooled connection is held until the generator finishes
+        # or is closed; leftover rows are drained so the next borrower gets a clean connection.
+        with self._get_conn() as conn:
+            cur = conn.cursor()
+            try:
+                cur.execute("SELECT order_id, customer_name, status_code FROM Orders ORDER BY order_id DESC")
+                for oid, cust, st in cur:
+                    yield oid, cust or "", st
+            finally:
+                conn.consume_results()
+                cur.close()
+
+    def get_order_items(self, order_id: Union[int, str]) -> Tuple[List[Tuple[str, int, Decimal, Decimal]], Decimal]:
+        with self._get_conn() as conn, conn.cursor(buffered=True) as cur:
+            cur.execute(_SQL_ORDER_ITEMS, (int(order_id),))
+            rows = cur.fetchall()
+        if not rows:
+            return [], Decimal(0)
+        items, total = [r[:4] for r in rows], rows[0][4]
+        # totals stay server-side (DECIMAL, exact); dev-only cross-check, stripped under -O
+        assert total == sum(r[3] for r in items), (order_id, total)
         return items, total
 
-    def get_next_statuses(self, current_status: str) -> List[str]:
-        return self.STATUS_FLOW.get(current_status, [])
+    def get_next_statuses(self, current_status: str) -> Tuple[str, ...]:
+        return self.STATUS_FLOW.get(current_status, ())
 
     def update_order_status(self, order_id: Union[int, str], new_status: str) -> None:
-        self.cur.execute("SELECT status_code FROM Orders WHERE order_id=%s", (int(order_id),))
-        row = self.cur.fetchone()
-        if not row:
-            raise ValueError("ORDER_NOT_FOUND")
-        current = row[0]
-        # transition rules
-        if new_status == "CANCELED":
-            if current in ("COMPLETED", "CANCELED"):
-                raise ValueError("INVALID_TRANSITION")
-        elif new_status not in self.get_next_statuses(current):
+        prev = self.ALLOWED_PREV.get(new_status)
+        if not prev:
             raise ValueError("INVALID_TRANSITION")
-        self.cur.execute("UPDATE Orders SET status_code=%s WHERE order_id=%s", (new_status, int(order_id)))
-        self.conn.commit()
+        order_id = int(order_id)  # may arrive as a Treeview string
+        with self._get_conn() as conn, conn.cursor(buffered=True) as cur:
+            # transition rule lives in the WHERE: one round-trip, no read-then-write race
+            cur.execute(
+                "UPDATE Orders SET status_code=%s WHERE order_id=%s AND status_code IN ("
+                + ",".join(["%s"] * len(prev)) + ")",
+                (new_status, order_id, *prev),
+            )
+            conn.commit()
+            if cur.rowcount == 0:
+                # failure path only: tell a missing order from an illegal move
+                cur.execute(_SQL_ORDER_STATUS, (order_id,))
+                if not cur.fetchone():
+                    raise ValueError("ORDER_NOT_FOUND")
+                raise ValueError("INVALID_TRANSITION")
 
     # user cancellation
     def cancel_order_by_user(self, order_id: Union[int, str], requester_user_id: int) -> None:
-        self.cur.execute("SELECT user_id, status_code FROM Orders WHERE order_id=%s", (int(order_id),))
-        row = self.cur.fetchone()
-        if not row:
-            raise ValueError("ORDER_NOT_FOUND")
-        owner_id, status_code = (int(row[0]) if row[0] is not None else None), row[1]
-        if owner_id != int(requester_user_id):
-            raise PermissionError("You can cancel only your own orders.")
-        if status_code not in ("RECEIVED", "IN_PROGRESS", "READY"):
+        order_id = int(order_id)  # may arrive as a Treeview string
+        with self._get_conn() as conn, conn.cursor(buffered=True) as cur:
+            # ownership + status checked by the UPDATE itself; the SELECT only runs to explain a miss
+            cur.execute(
+                _SQL_CANCEL_ORDER + self._SQL_CANCELABLE,
+                (order_id, requester_user_id, *self.ALLOWED_PREV["CANCELED"]),
+            )
+            if cur.rowcount:
+                conn.commit()
+                return
+            # nothing changed: no COMMIT round trip, _get_conn rolls back the empty transaction
+            cur.execute(_SQL_ORDER_OWNER_STATUS, (order_id,))
+            row = cur.fetchone()
+            if not row:
+                raise ValueError("ORDER_NOT_FOUND")
+            if row[0] != requester_user_id:
+                raise PermissionError("You can cancel only your own orders.")
             raise ValueError("CANNOT_CANCEL_THIS_STATUS")
-        self.cur.execute("UPDATE Orders SET status_code='CANCELED' WHERE order_id=%s", (int(order_id),))
-        self.conn.commit()
+
+    def cancel_orders_bulk(
+        self, order_ids: Sequence[Union[int, str]], requester_user_id: Optional[int] = None
+    ) -> List[int]:
+        # one locking SELECT + one UPDATE + one commit for the whole batch. requester_user_id=None
+        # is the staff path (any owner); otherwise only the requester's own orders qualify.
+        # Returns the ids actually canceled; missing, foreign or already closed ones are skipped.
+        ids = [int(o) for o in order_ids]
+        if not ids:
+            return []
+        sql = (
+            "SELECT order_id FROM Orders WHERE order_id IN (" + ",".join(["%s"] * len(ids)) + ")"
+            " AND " + self._SQL_CANCELABLE
+        )
+        params: List[Union[int, str]] = [*ids, *self.ALLOWED_PREV["CANCELED"]]
+        if requester_user_id is not None:
+            sql += " AND user_id=%s"
+            params.append(requester_user_id)
+        with self._get_conn() as conn, conn.cursor(buffered=True) as cur:
+            cur.execute(sql + " FOR UPDATE", tuple(params))
+            allowed = [r[0] for r in cur]
+            if allowed:
+                cur.execute(
+                    "UPDATE Orders SET status_code='CANCELED' WHERE order_id IN ("
+                    + ",".join(["%s"] * len(allowed)) + ")",
+                    tuple(allowed),
+                )
+                conn.commit()
+        return allowed
 
     # courier view
     def get_delivery_orders(
@@ -707,66 +1168,99 @@ class DatabaseManager:
         status: Optional[str] = None,
         search_text: str = "",
         limit: int = 400,
-    ) -> List[Tuple[int, str, str, str, float, str]]:
-        sql = """
-        SELECT o.order_id,
-               DATE_FORMAT(o.order_date, '%Y-%m-%d %H:%i'),
-               COALESCE(o.customer_name,''),
-               o.status_code,
-               COALESCE(v.total,0),
-               COALESCE(o.delivery_address,'')
-        FROM Orders o
-        LEFT JOIN v_order_totals v ON v.order_id = o.order_id
-        WHERE o.service_type='DELIVERY'
-        """
+        after_id: Optional[int] = None,
+    ) -> List[Tuple[int, str, str, str, Decimal, str]]:
+        sql = _SQL_DELIVERY_LIST
         params: List[Union[str, int]] = []
         if status:
             sql += " AND o.status_code=%s"
             params.append(status)
-        if search_text:
-            like = f"%{search_text.strip()}%"
-            sql += " AND (o.customer_name LIKE %s OR o.customer_contact LIKE %s OR o.notes LIKE %s OR o.delivery_address LIKE %s)"
-            params += [like, like, like, like]
-        sql += " ORDER BY o.order_date DESC LIMIT %s"
-        params.append(int(limit))
-        self.cur.execute(sql, tuple(params))
-        rows = self.cur.fetchall()
-        return [(int(r[0]), r[1], r[2], r[3], float(r[4]), r[5]) for r in rows]
+        if search_text and not search_text.isspace():
+            clause, args = self._order_search(search_text, _DELIVERY_SEARCH_COLS)
+            sql += clause
+            params += args
+        if after_id is not None:
+            sql += _SQL_SEEK_BEFORE
+            params.append(after_id)
+        sql += _SQL_NEWEST_FIRST
+        params.append(limit)
+        # unbuffered + fetchall: rows are parsed straight into the returned list, no driver-side
+        # buffer copied out of it (same below for the reports)
+        with self._get_conn() as conn, conn.cursor() as cur:
+            cur.execute(sql, tuple(params))
+            return cur.fetchall()
 
     # analytics
     def get_status_list(self) -> List[str]:
-        self.cur.execute("SELECT status_code FROM OrderStatusRef ORDER BY sort_order")
-        return [r[0] for r in self.cur.fetchall()]
+        if self._status_cache is None:
+            with self._get_conn() as conn, conn.cursor(buffered=True) as cur:
+                cur.execute(_SQL_STATUS_LIST)
+                self._status_cache = tuple(r[0] for r in cur)
+        return list(self._status_cache)
+
+    def invalidate_status_cache(self) -> None:
+        self._status_cache = None
 
     def report_orders(
         self,
         start_dt: str,
         end_dt: str,
         statuses: Optional[List[str]] = None,
-    ) -> List[Tuple[int, str, str, str, Optional[str], float]]:
-        have_service = self._column_exists("Orders", "service_type")
-        service_sql = "o.service_type" if have_service else "NULL"
-
-        sql = f"""
-        SELECT o.order_id,
-               DATE_FORMAT(o.order_date, '%Y-%m-%d %H:%i'),
-               COALESCE(o.customer_name,''),
-               o.status_code,
-               {service_sql} AS service_type,
-               COALESCE(v.total,0)
-        FROM Orders o
-        LEFT JOIN v_order_totals v ON v.order_id = o.order_id
-        WHERE o.order_date BETWEEN %s AND %s
-        """
+        page_size: Optional[int] = None,
+        after_id: Optional[int] = None,
+    ) -> List[Tuple[int, str, str, str, Optional[str], Decimal]]:
+        # seek paging: pass page_size, then the last order_id of the previous page as after_id.
+        # The (order_date, order_id) key is looked up server-side since the returned date is
+        # minute-formatted; idx_orders_order_date (+ implicit PK) serves the order. No page_size
+        # keeps the old return-everything behaviour.
+        sql, params = self._report_orders_query(start_dt, end_dt, statuses, page_size, after_id)
+        with self._get_conn() as conn, conn.cursor() as cur:
+            cur.execute(sql, params)
+            # (oid, dt, customer, status, service, total)
+            return cur.fetchall()
+
+    def iter_report_orders(
+        self,
+        start_dt: str,
+        end_dt: str,
+        statuses: Optional[List[str]] = None,
+        chunk_size: int = 1000,
+    ) -> Iterator[List[Tuple[int, str, str, str, Optional[str], Decimal]]]:
+        # same rows as report_orders, handed out chunk_size at a time for exports, so only one
+        # chunk is alive in Python; connection rules as iter_all_orders
+        sql, params = self._report_orders_query(start_dt, end_dt, statuses, None, None)
+        with self._get_conn() as conn:
+            cur = conn.cursor()
+            try:
+                cur.execute(sql, params)
+                while True:
+                    chunk = cur.fetchmany(chunk_size)
+                    if not chunk:
+                        break
+                    yield chunk
+            finally:
+                conn.consume_results()
+                cur.close()
+
+    def _report_orders_query(
+        self,
+        start_dt: str,
+        end_dt: str,
+        statuses: Optional[List[str]],
+        page_size: Optional[int],
+        after_id: Optional[int],
+    ) -> Tuple[str, Tuple]:
+        sql = _report_orders_sql(
+            self._has_service_type_col, len(statuses or ()), after_id is not None, page_size is not None
+        )
         params: List[Union[str, int]] = [start_dt, end_dt]
         if statuses:
-            sql += " AND o.status_code IN (" + ",".join(["%s"] * len(statuses)) + ")"
             params.extend(statuses)
-        sql += " ORDER BY o.order_date DESC"
-        self.cur.execute(sql, tuple(params))
-        rows = self.cur.fetchall()
-        # (oid, dt, customer, status, service, total)
-        return [(int(r[0]), r[1], r[2], r[3], (r[4] if r[4] is not None else None), float(r[5])) for r in rows]
+        if after_id is not None:
+            params.append(after_id)
+        if page_size is not None:
+            params.append(page_size)
+        return sql, tuple(params)
 
     def report_top_items(
         self,
@@ -774,23 +1268,13 @@ class DatabaseManager:
         end_dt: str,
         statuses: Optional[List[str]] = None,
         limit: int = 20,
-    ) -> List[Tuple[str, int, float]]:
-
-        sql = """
-        SELECT mi.name,
-               SUM(oi.quantity) AS qty,
-               SUM(oi.quantity * oi.price_at_order) AS revenue
-        FROM OrderItems oi
-        JOIN Orders o ON o.order_id = oi.order_id
-        JOIN MenuItems mi ON mi.item_id = oi.item_id
-        WHERE o.order_date BETWEEN %s AND %s
-        """
+    ) -> List[Tuple[str, Decimal, Decimal]]:
+        sql = _report_top_items_sql(len(statuses or ()))
         params: List[Union[str, int]] = [start_dt, end_dt]
         if statuses:
-            sql += " AND o.status_code IN (" + ",".join(["%s"] * len(statuses)) + ")"
             params.extend(statuses)
-        sql += " GROUP BY mi.name ORDER BY qty DESC, revenue DESC LIMIT %s"
-        params.append(int(limit))
-        self.cur.execute(sql, tuple(params))
-        rows = self.cur.fetchall()
-        return [(r[0], int(r[1]), float(r[2])) for r in rows]
+        params.append(limit)
+        with self._get_conn() as conn, conn.cursor() as cur:
+            cur.execute(sql, tuple(params))
+            # SUM() is DECIMAL even for the INT quantity; the UI casts when it formats
+            return cur.fetchall()
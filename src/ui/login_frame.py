@@ -1,4 +1,5 @@
 # ui/login_frame.py
+import threading
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
 from typing import Optional, Tuple, Callable
@@ -17,6 +18,7 @@ class LoginFrame(tk.Frame):
         self.db = db_manager
         self.on_success = on_success
         self.on_go_register = on_go_register
+        self._busy = False
 
         self._build_login()
 
@@ -40,44 +42,92 @@ class LoginFrame(tk.Frame):
         tk.Entry(form, textvariable=self.username).grid(row=0, column=1, sticky="ew", pady=6)
         tk.Entry(form, textvariable=self.password, show="*").grid(row=1, column=1, sticky="ew", pady=6)
 
+        # failed attempts are reported here instead of a modal dialog
+        self._error_var = tk.StringVar()
+        ttk.Label(self, textvariable=self._error_var, foreground="#c0392b").grid(row=2, column=0)
+
         buttons = tk.Frame(self)
-        buttons.grid(row=2, column=0, pady=(6, 2))
+        buttons.grid(row=3, column=0, pady=(6, 2))
 
-        ttk.Button(buttons, text="Login", command=self._login_user).pack(side="left", padx=(0, 8))
-        ttk.Button(buttons, text="Login as Admin", command=self._login_as_admin).pack(side="left")
+        self._btn_login = ttk.Button(buttons, text="Login", command=self._login_user)
+        self._btn_login.pack(side="left", padx=(0, 8))
+        self._btn_admin = ttk.Button(buttons, text="Login as Admin", command=self._login_as_admin)
+        self._btn_admin.pack(side="left")
 
         footer = tk.Frame(self)
-        footer.grid(row=3, column=0, pady=(10, 6))
+        footer.grid(row=4, column=0, pady=(10, 6))
         tk.Label(footer, text="No account?").pack(side="left")
-        link = tk.Label(footer, text="Create one", fg="#1b6ac9", cursor="hand2")
-        link.pack(side="left", padx=(4, 0))
-        link.bind("<Button-1>", lambda _e: self._open_register())
+        self._link = tk.Label(footer, text="Create one", fg="#1b6ac9", cursor="hand2")
+        self._link.pack(side="left", padx=(4, 0))
+        self._link.bind("<Button-1>", lambda _e: self._open_register())
 
     def _login_user(self) -> None:
+        if self._busy:
+            return
         u = self.username.get().strip()
         p = self.password.get()
         if not u or not p:
-            messagebox.showwarning("Missing", "Enter username and password.")
-            return
-
-        user = self.db.authenticate_user(u, p)
-        if not user:
-            messagebox.showerror("Login failed", "Invalid username or password.")
+            self._error_var.set("Enter username and password.")
             return
 
-        self.on_success(user)
+        self._verify_async(
+            lambda: self.db.authenticate_user(u, p),
+            "Invalid username or password.",
+        )
 
     def _login_as_admin(self) -> None:
+        if self._busy:
+            return
         pw = simpledialog.askstring("Admin login", "Admin password:", show="*", parent=self)
         if pw is None:
             return
-        user = self.db.authenticate_admin_password(pw)
+        self._verify_async(
+            lambda: self.db.authenticate_admin_password(pw),
+            "Wrong admin password.",
+        )
+
+    def _verify_async(self, check: Callable[[], Optional[Tuple[int, str, str]]], fail_msg: str) -> None:
+        # bcrypt is deliberately slow; run it on a worker so the window keeps repainting,
+        # and hand the result back to the Tk thread via after()
+        self._error_var.set("")
+        self._set_busy(True)
+
+        def work() -> None:
+            try:
+                user, err = check(), None
+            except Exception as e:
+                user, err = None, e
+            try:
+                self.after(0, lambda: self._finish_login(user, err, fail_msg))
+            except (RuntimeError, tk.TclError):  # window closed meanwhile
+                pass
+
+        threading.Thread(target=work, daemon=True).start()
+
+    def _finish_login(self, user, err: Optional[Exception], fail_msg: str) -> None:
+        if not self.winfo_exists():  # frame torn down while the check ran
+            return
+        self._set_busy(False)
+        if err is not None:
+            messagebox.showerror("Error", str(err))
+            return
         if not user:
-            messagebox.showerror("Access denied", "Wrong admin password.")
+            self._error_var.set(fail_msg)
             return
         self.on_success(user)
 
+    def _set_busy(self, busy: bool) -> None:
+        self._busy = busy
+        state = "disabled" if busy else "normal"
+        self._btn_login.configure(state=state)
+        self._btn_admin.configure(state=state)
+        # a Label ignores state for its bindings; _open_register checks _busy as well
+        self._link.configure(state=state, cursor="" if busy else "hand2")
+        self.configure(cursor="watch" if busy else "")
+
     def _open_register(self) -> None:
+        if self._busy:
+            return
         if callable(self.on_go_register):
             self.on_go_register()
         else:
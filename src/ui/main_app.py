@@ -3,6 +3,7 @@ from tkinter import ttk, messagebox, simpledialog, filedialog
 from typing import Tuple, List, Optional
 from datetime import datetime, timedelta
 import csv
+from concurrent.futures import Future, ThreadPoolExecutor
 
 import matplotlib
 matplotlib.use("TkAgg")
@@ -10,6 +11,48 @@ from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolb
 import matplotlib.pyplot as plt
 
 
+# order lists load this many rows at first and append another page when scrolled to the bottom
+ORDER_PAGE_SIZE = 200
+
+# order-details item lists kept for re-opening; the oldest go first past this many
+ORDER_ITEMS_CACHE_SIZE = 32
+
+# quiet period after the last filter keystroke before an order list reloads
+FILTER_DEBOUNCE_MS = 150
+
+# status filter choices ("" = any); one shared tuple for every filter combobox
+STATUS_FILTER_VALUES = ("", "RECEIVED", "IN_PROGRESS", "READY", "COMPLETED", "CANCELED")
+
+# (column, width, anchor) specs for _build_tree; the heading text is the column id
+ORDER_TREE_COLUMNS = (("ID", 70, "center"), ("Date", 150, "w"), ("Customer", 220, "w"),
+                      ("Status", 120, "center"), ("Total", 90, "e"))
+DELIVERY_TREE_COLUMNS = (("ID", 70, "center"), ("Date", 150, "w"), ("Customer", 180, "w"),
+                         ("Status", 120, "center"), ("Total", 90, "e"), ("Address", 260, "w"))
+REPORT_ORDER_TREE_COLUMNS = (("ID", 70, "center"), ("Date", 150, "w"), ("Customer", 200, "w"),
+                             ("Status", 120, "center"), ("Service", 100, "center"), ("Total", 100, "e"))
+REPORT_ITEM_TREE_COLUMNS = (("Item", 260, "w"), ("Qty", 80, "center"), ("Revenue", 120, "e"))
+DETAILS_TREE_COLUMNS = (("Item", 260, "w"), ("Qty", 60, "center"), ("Price", 100, "e"), ("Subtotal", 120, "e"))
+MENU_TREE_COLUMNS = (("ID", 60, "center"), ("Name", 260, "w"), ("Price", 120, "e"), ("Active", 80, "center"))
+
+
+def _build_tree(parent, columns, **kw) -> ttk.Treeview:
+    # headings-only Treeview from a column spec: one heading + one column call per column
+    tree = ttk.Treeview(parent, columns=[c for c, _w, _a in columns], show="headings", **kw)
+    heading, column = tree.heading, tree.column
+    for c, width, anchor in columns:
+        heading(c, text=c)
+        column(c, width=width, anchor=anchor)
+    return tree
+
+
+def _index_categories(categories) -> Tuple[dict, Tuple[str, ...]]:
+    # one pass over (id, name) rows -> (name -> id, names in display order) for a category combo
+    by_name = {}
+    for cid, name in categories:
+        by_name[name] = cid
+    return by_name, tuple(by_name)
+
+
 class ChartConfigDialog(tk.Toplevel):
 
     TYPES = [
@@ -122,6 +165,15 @@ Accordingly, the tab(s) inside Admin opens.
         self._user_right_visible = False
         self.admin_tab = None
         self.admin_nb = None
+        # per diffed Treeview: iid -> values last shown, so reloads only touch changed rows
+        self._tree_rows = {}
+        self._tree_limits = {}  # per order Treeview: rows currently requested
+        self._tree_fetch = {}  # per order Treeview: fetch(limit, after_id) for its current filters
+        self._first_show = {}  # notebook -> {tab path: loader} for pages not filled yet
+        self._filter_after = {}  # order Treeview -> pending debounced reload (after id)
+        self._order_items_cache = {}  # (order id, status) -> get_order_items() result
+        # one worker: list fetches run in order, off the Tk thread (see _in_background)
+        self._db_worker = ThreadPoolExecutor(max_workers=1)
 
         self._build_shell()
         self._build_orders_tab()
@@ -166,32 +218,35 @@ Accordingly, the tab(s) inside Admin opens.
 
         # Categories
         tk.Label(left, text="Category:").grid(row=0, column=0, sticky="w", padx=6, pady=(6, 2))
-        self.categories = self.db.get_categories()
-        self.cat_id_by_name = {name: cid for cid, name in self.categories}
+        # filled by _apply_order_menu once the startup fetch lands
+        self.categories = []
+        self.cat_id_by_name = {}
         self.cat_sel = tk.StringVar()
-        cat_names = [name for _, name in self.categories]
-        self.cat_combo = ttk.Combobox(left, textvariable=self.cat_sel, values=cat_names,
+        self.cat_combo = ttk.Combobox(left, textvariable=self.cat_sel, values=(),
                                       state="readonly", width=24)
         self.cat_combo.grid(row=1, column=0, padx=6, pady=(0, 6))
         self.cat_combo.bind("<<ComboboxSelected>>", lambda e: self._load_items_for_category())
 
         # Items list
         self.items_listbox = tk.Listbox(left, width=28, height=14)
+        self.items_ids = []
+        self.items_labels = []
         self.items_listbox.grid(row=2, column=0, padx=6, pady=(0, 6))
 
         # Qty + Add
         qty_row = tk.Frame(left)
         qty_row.grid(row=3, column=0, sticky="ew", padx=6, pady=(0, 6))
         tk.Label(qty_row, text="Qty:").pack(side="left")
-        self.qty_var = tk.IntVar(value=1)
-        tk.Spinbox(qty_row, from_=1, to=100, textvariable=self.qty_var, width=6)\
-            .pack(side="left", padx=(4, 8))
+        # read straight from the widget (no Tcl variable); starts at from_=1
+        self.qty_spin = tk.Spinbox(qty_row, from_=1, to=100, width=6)
+        self.qty_spin.pack(side="left", padx=(4, 8))
         tk.Button(qty_row, text="Add to cart", command=self._cart_add)\
             .pack(side="left")
 
         # Cart
         tk.Label(left, text="Cart:").grid(row=4, column=0, sticky="w", padx=6)
         self.cart_list = tk.Listbox(left, width=28, height=10)
+        self.cart_items: List[Tuple[int, int]] = []  # (item_id, qty) per cart_list row
         self.cart_list.grid(row=5, column=0, padx=6, pady=(0, 6))
 
         row_btns = tk.Frame(left)
@@ -207,55 +262,93 @@ Accordingly, the tab(s) inside Admin opens.
         tk.Entry(left, textvariable=self.customer_var, width=28)\
             .grid(row=8, column=0, padx=6, pady=(0, 4))
 
+        # Startup reads run on the DB worker while the rest of the window is built, so
+        # nothing blocks the first paint; the worker is FIFO, so they land in this order
+        self._in_background(self._fetch_order_menu, self._apply_order_menu)
+
         # Right pane
         if self.role == "admin":
             self._build_admin_right_panel()
             self._reload_orders_admin()
         else:
-            try:
-                has_any = len(self.db.get_orders_for_user(self.user_id, limit=1)) > 0
-            except Exception:
-                has_any = False
-            self._build_user_right_panel(hidden=not has_any)
-            if has_any:
-                self.u_status_sel.set("")
-                self._reload_orders_user()
-
-        # Init items list
+            # the panel stays hidden until the user has at least one order
+            self._build_user_right_panel(hidden=True)
+            self._in_background(self._user_has_orders, self._show_user_orders_if_any)
+
+    def _fetch_order_menu(self):
+        # worker thread: categories plus the first category's items in one trip
+        categories = self.db.get_categories()
+        items = self.db.get_menu_items(category_id=categories[0][0], active_only=True) if categories else []
+        return categories, items
+
+    def _apply_order_menu(self, result) -> None:
+        if self.categories:  # _admin_reload_categories got there first with fresher data
+            return
+        categories, items = result
+        self.categories = categories
+        self.cat_id_by_name, cat_names = _index_categories(categories)
+        self.cat_combo["values"] = cat_names
         if cat_names:
             self.cat_sel.set(cat_names[0])
-            self._load_items_for_category()
+            self._show_menu_items(items)
+
+    def _user_has_orders(self) -> bool:
+        try:
+            return len(self.db.get_orders_for_user(self.user_id, limit=1)) > 0
+        except Exception:
+            return False
+
+    def _show_user_orders_if_any(self, has_any: bool) -> None:
+        if has_any:
+            self._ensure_user_right_visible()
+            self._reload_orders_user()
 
     # Orders helpers (left pane/cart)
     def _load_items_for_category(self):
+        cid = self.cat_id_by_name.get(self.cat_sel.get())
+        # no category -> empty list; the listbox and its index arrays are cleared in one place
+        items = self.db.get_menu_items(category_id=cid, active_only=True) if cid is not None else ()
+        self._show_menu_items(items)
+
+    def _show_menu_items(self, items) -> None:
         self.items_listbox.delete(0, tk.END)
-        cat = self.cat_sel.get()
-        if not cat:
-            return
-        cid = self.cat_id_by_name.get(cat)
-        if cid is None:
-            return
-        items = self.db.get_menu_items(category_id=cid, active_only=True)
-        self.items_cache = {f"{name} (${price:.2f})": (iid, price) for iid, name, price, _cid, _act in items}
-        for label in self.items_cache.keys():
-            self.items_listbox.insert(tk.END, label)
+        # ids ride alongside the listbox rows (same index), so nothing is parsed back from the labels
+        self.items_ids = [iid for iid, *_ in items]
+        self.items_labels = [f"{name} (${price:.2f})" for _iid, name, price, _cid, _act in items]
+        self.items_listbox.insert(tk.END, *self.items_labels)
 
     def _cart_add(self):
         sel = self.items_listbox.curselection()
         if not sel:
             return
-        label = self.items_listbox.get(sel[0])
-        qty = max(1, int(self.qty_var.get()))
+        text = self.qty_spin.get().strip()
+        qty = int(text) if text.isdecimal() else 0
+        if qty < 1:
+            messagebox.showwarning("Quantity", "Quantity must be a whole number of at least 1.")
+            return
+        label = self.items_labels[sel[0]]  # cached text, no listbox round trip
+        item_id = self.items_ids[sel[0]]
+        # same dish again: bump the existing line instead of adding a second one
+        for i, (cart_id, cart_qty) in enumerate(self.cart_items):
+            if cart_id == item_id:
+                qty += cart_qty
+                self.cart_items[i] = (item_id, qty)
+                self.cart_list.delete(i)
+                self.cart_list.insert(i, f"{label} x {qty}")
+                return
         self.cart_list.insert(tk.END, f"{label} x {qty}")
+        # kept in step with cart_list, so lines from any category stay resolvable
+        self.cart_items.append((item_id, qty))
 
     def _cart_remove(self):
         sel = list(self.cart_list.curselection())
         for i in reversed(sel):
             self.cart_list.delete(i)
+            del self.cart_items[i]
 
     # Create order flow
     def _open_create_order_dialog(self):
-        if self.cart_list.size() == 0:
+        if not self.cart_items:
             messagebox.showwarning("Cart is empty", "Add items to the cart first.")
             return
 
@@ -295,15 +388,7 @@ Accordingly, the tab(s) inside Admin opens.
             self._dlg_addr_var.set("")
 
     def _confirm_create_order(self, dlg: tk.Toplevel):
-        items: List[Tuple[int, int]] = []
-        for i in range(self.cart_list.size()):
-            row = self.cart_list.get(i)
-            try:
-                name_part, qty_str = row.rsplit(" x ", 1)
-            except ValueError:
-                continue
-            item_id, _price = self.items_cache[name_part]
-            items.append((item_id, int(qty_str)))
+        items: List[Tuple[int, int]] = list(self.cart_items)
 
         customer = (self.customer_var.get() or "").strip()
         stype = self._dlg_service_type.get()
@@ -335,7 +420,9 @@ Accordingly, the tab(s) inside Admin opens.
         messagebox.showinfo("Success", f"Order #{oid} created.")
 
         self.cart_list.delete(0, tk.END)
-        self.qty_var.set(1)
+        self.cart_items.clear()
+        self.qty_spin.delete(0, tk.END)
+        self.qty_spin.insert(0, "1")
 
         if self.role == "user":
             self._ensure_user_right_visible()
@@ -352,7 +439,7 @@ Accordingly, the tab(s) inside Admin opens.
         filt.pack(fill="x", padx=6, pady=4)
 
         tk.Label(filt, text="Status:").pack(side="left")
-        self.u_statuses = ["", "RECEIVED", "IN_PROGRESS", "READY", "COMPLETED", "CANCELED"]
+        self.u_statuses = STATUS_FILTER_VALUES
         self.u_status_sel = tk.StringVar(value="")
         ttk.Combobox(filt, textvariable=self.u_status_sel, values=self.u_statuses,
                      width=14, state="readonly").pack(side="left", padx=(4, 12))
@@ -364,15 +451,9 @@ Accordingly, the tab(s) inside Admin opens.
         tk.Button(filt, text="Apply", command=self._reload_orders_user)\
             .pack(side="left")
 
-        cols = ("ID", "Date", "Customer", "Status", "Total")
-        self.user_tree = ttk.Treeview(self.user_right, columns=cols, show="headings", height=18)
-        for c in cols:
-            self.user_tree.heading(c, text=c)
-        self.user_tree.column("ID", width=70, anchor="center")
-        self.user_tree.column("Date", width=150)
-        self.user_tree.column("Customer", width=220)
-        self.user_tree.column("Status", width=120, anchor="center")
-        self.user_tree.column("Total", width=90, anchor="e")
+        self.user_tree = _build_tree(self.user_right, ORDER_TREE_COLUMNS, height=18)
+        self._page_on_scroll(self.user_tree)
+        self._reload_on_filter_change(self.user_tree, self._reload_orders_user, self.u_status_sel, self.u_search_var)
         self.user_tree.pack(fill="both", expand=True, padx=6, pady=6)
         self.user_tree.bind("<Double-1>", lambda e: self._view_order_details_user())
 
@@ -398,7 +479,7 @@ Accordingly, the tab(s) inside Admin opens.
 
         filters = tk.Frame(right); filters.pack(fill="x", padx=6, pady=4)
         tk.Label(filters, text="Status:").pack(side="left")
-        self.a_statuses = ["", "RECEIVED", "IN_PROGRESS", "READY", "COMPLETED", "CANCELED"]
+        self.a_statuses = STATUS_FILTER_VALUES
         self.a_status_sel = tk.StringVar(value="")
         ttk.Combobox(filters, textvariable=self.a_status_sel, values=self.a_statuses,
                      width=14, state="readonly").pack(side="left", padx=(4, 12))
@@ -408,15 +489,9 @@ Accordingly, the tab(s) inside Admin opens.
             .pack(side="left", padx=(4, 8))
         tk.Button(filters, text="Apply", command=self._reload_orders_admin).pack(side="left")
 
-        cols = ("ID", "Date", "Customer", "Status", "Total")
-        self.admin_tree = ttk.Treeview(right, columns=cols, show="headings", height=18)
-        for c in cols:
-            self.admin_tree.heading(c, text=c)
-        self.admin_tree.column("ID", width=70, anchor="center")
-        self.admin_tree.column("Date", width=150)
-        self.admin_tree.column("Customer", width=220)
-        self.admin_tree.column("Status", width=120, anchor="center")
-        self.admin_tree.column("Total", width=90, anchor="e")
+        self.admin_tree = _build_tree(right, ORDER_TREE_COLUMNS, height=18)
+        self._page_on_scroll(self.admin_tree)
+        self._reload_on_filter_change(self.admin_tree, self._reload_orders_admin, self.a_status_sel, self.a_search_var)
         self.admin_tree.pack(fill="both", expand=True, padx=6, pady=6)
         self.admin_tree.bind("<Double-1>", lambda e: self._view_order_details_admin())
 
@@ -430,26 +505,143 @@ Accordingly, the tab(s) inside Admin opens.
     def _reload_orders_user(self):
         if self.role != "user" or not hasattr(self, "user_tree"):
             return
-        for i in self.user_tree.get_children():
-            self.user_tree.delete(i)
         status = self.u_status_sel.get() or None
         search = self.u_search_var.get()
-        try:
-            rows = self.db.get_orders_for_user(self.user_id, status=status, search_text=search, limit=600)
-        except Exception:
-            rows = self.db.get_orders(status=status, search_text=search, limit=600)
-        for oid, dt, cust, st, total in rows:
-            self.user_tree.insert("", "end", values=(oid, dt, cust, st, f"{total:.2f}"))
+
+        def fetch(limit, after_id):
+            try:
+                return self.db.get_orders_for_user(
+                    self.user_id, status=status, search_text=search, limit=limit, after_id=after_id
+                )
+            except Exception:
+                return self.db.get_orders(status=status, search_text=search, limit=limit, after_id=after_id)
+
+        self._load_order_tree(self.user_tree, fetch)
 
     def _reload_orders_admin(self):
         if self.role != "admin" or not hasattr(self, "admin_tree"):
             return
-        for i in self.admin_tree.get_children():
-            self.admin_tree.delete(i)
-        status = self.a_status_sel.get() or None
-        search = self.a_search_var.get()
-        for oid, dt, cust, st, total in self.db.get_orders(status=status, search_text=search, limit=600):
-            self.admin_tree.insert("", "end", values=(oid, dt, cust, st, f"{total:.2f}"))
+        self._reload_order_tree(self.admin_tree, self.a_status_sel, self.a_search_var)
+
+    def _reload_order_tree(self, tree: ttk.Treeview, status_var: tk.StringVar, search_var: tk.StringVar) -> None:
+        # Tk variables are read here, on the Tk thread; only the query runs on the worker
+        status = status_var.get() or None
+        search = search_var.get()
+        self._load_order_tree(
+            tree,
+            lambda limit, after_id: self.db.get_orders(
+                status=status, search_text=search, limit=limit, after_id=after_id
+            ),
+        )
+
+    def _load_order_tree(self, tree: ttk.Treeview, fetch) -> None:
+        # a reload re-reads every row loaded so far in one query; fetch is kept so scrolling to
+        # the bottom can ask the same filters for just the next page (_page_on_scroll)
+        self._cancel_filter_reload(tree)
+        self._tree_fetch[tree] = fetch
+        limit = self._tree_limit(tree)
+        self._in_background(lambda: fetch(limit, None), lambda rows: self._sync_order_tree(tree, rows))
+
+    def _in_background(self, fetch, apply) -> None:
+        # DB I/O on the worker thread; apply(result) runs back on the Tk thread via after(),
+        # so widgets are never touched from the worker
+        def done(fut: Future) -> None:
+            try:
+                self.after(0, self._apply_background, fut, apply)
+            except (RuntimeError, tk.TclError):  # window already closed
+                pass
+
+        self._db_worker.submit(fetch).add_done_callback(done)
+
+    def _apply_background(self, fut: Future, apply) -> None:
+        try:
+            result = fut.result()
+        except Exception as e:
+            messagebox.showerror("Database error", str(e))
+            return
+        try:
+            apply(result)
+        except tk.TclError:  # target widget destroyed while the query ran
+            pass
+
+    def _tree_limit(self, tree: ttk.Treeview) -> int:
+        return self._tree_limits.get(tree, ORDER_PAGE_SIZE)
+
+    def _page_on_scroll(self, tree: ttk.Treeview) -> None:
+        # the order trees have no scrollbar, so yscrollcommand is free to watch for the bottom
+        # (wheel/keys): a full page there means there may be more, so fetch the page after the
+        # last row shown and append it
+        def on_scroll(_first, last):
+            fetch = self._tree_fetch.get(tree)
+            shown = self._tree_rows.get(tree, {})
+            limit = self._tree_limit(tree)
+            if fetch is None or float(last) < 0.999 or len(shown) < limit:
+                return
+            self._tree_limits[tree] = limit + ORDER_PAGE_SIZE  # also stops repeats until it lands
+            after_id = int(next(reversed(shown)))
+            self._in_background(
+                lambda: fetch(ORDER_PAGE_SIZE, after_id),
+                lambda rows: self._append_order_page(tree, fetch, rows),
+            )
+
+        tree.configure(yscrollcommand=on_scroll)
+
+    def _append_order_page(self, tree: ttk.Treeview, fetch, rows) -> None:
+        if self._tree_fetch.get(tree) is not fetch:  # reloaded meanwhile; that load covers it
+            return
+        page = {str(row[0]): row for row in rows}
+        self._sync_tree(tree, {**self._tree_rows.get(tree, {}), **page})
+
+    def _reload_on_filter_change(self, tree: ttk.Treeview, reload, *filter_vars: tk.Variable) -> None:
+        # typing/picking a filter reloads by itself once input pauses for FILTER_DEBOUNCE_MS, so a
+        # burst of keystrokes costs one query; Apply still reloads at once. A new filter starts
+        # again from the first page.
+        def changed(*_):
+            self._cancel_filter_reload(tree)
+            self._tree_limits.pop(tree, None)
+            self._filter_after[tree] = self.after(FILTER_DEBOUNCE_MS, reload)
+
+        for var in filter_vars:
+            var.trace_add("write", changed)
+
+    def _cancel_filter_reload(self, tree: ttk.Treeview) -> None:
+        # every reload calls this, so an explicit one supersedes a debounced one still pending
+        pending = self._filter_after.pop(tree, None)
+        if pending:
+            self.after_cancel(pending)
+
+    def _sync_order_tree(self, tree: ttk.Treeview, rows) -> None:
+        # rows go in as fetched: the total is a DECIMAL(.., 2) computed by SQL, so it already
+        # renders as "12.50" and needs no per-row f-string
+        self._sync_tree(tree, {str(row[0]): row for row in rows})
+
+    def _sync_menu_tree(self, tree: ttk.Treeview, rows) -> None:
+        self._sync_tree(
+            tree,
+            {str(iid): (iid, name, f"{price:.2f}", "Yes" if active else "No") for iid, name, price, _cid, active in rows},
+        )
+
+    def _sync_tree(self, tree: ttk.Treeview, new: dict) -> None:
+        # new: iid -> values in display order. Diff against what the tree shows instead of
+        # delete-all/insert-all: each Tcl call is a round trip, so a refresh after one status
+        # change or menu edit costs a few calls, not N
+        shown = self._tree_rows.get(tree, {})
+        gone = [iid for iid in shown if iid not in new]
+        if gone:
+            tree.delete(*gone)
+        # bound methods hoisted out of the loop: a first load inserts every row
+        get, insert, item = shown.get, tree.insert, tree.item
+        for iid, values in new.items():
+            old = get(iid)
+            if old is None:
+                insert("", "end", iid=iid, values=values)
+            elif old != values:
+                item(iid, values=values)
+        order = list(new)
+        if list(tree.get_children()) != order:
+            for idx, iid in enumerate(order):
+                tree.move(iid, "", idx)
+        self._tree_rows[tree] = new
 
     # details helpers
     def _get_selected_id_from_tree(self, tree: ttk.Treeview) -> Optional[int]:
@@ -458,66 +650,80 @@ Accordingly, the tab(s) inside Admin opens.
             return None
         return int(tree.item(sel, "values")[0])
 
+    def _selected_status(self, tree: ttk.Treeview) -> str:
+        return tree.item(tree.focus(), "values")[3]
+
+    def _order_items(self, oid: int, status: str):
+        # items only change while the status does, so (oid, status) is a safe key; a status
+        # changed elsewhere just misses and re-fetches
+        key = (oid, status)
+        cache = self._order_items_cache
+        hit = cache.get(key)
+        if hit is None:
+            hit = cache[key] = self.db.get_order_items(oid)
+            while len(cache) > ORDER_ITEMS_CACHE_SIZE:
+                del cache[next(iter(cache))]
+        return hit
+
+    def _forget_order_items(self, *oids: int) -> None:
+        drop = set(oids)
+        self._order_items_cache = {k: v for k, v in self._order_items_cache.items() if k[0] not in drop}
+
+    def _order_status_changed(self, tree: ttk.Treeview, status_var: tk.StringVar, reload, status: str,
+                              *oids: int) -> None:
+        # after a status change, rewrite just the Status cell(s) instead of re-fetching the list;
+        # a full reload is only needed when the status filter now hides those rows
+        self._forget_order_items(*oids)
+        want = status_var.get()
+        if want and want != status:
+            reload()
+            return
+        shown = self._tree_rows.get(tree, {})
+        for oid in oids:
+            iid = str(oid)
+            if iid not in shown:
+                continue
+            tree.set(iid, "Status", status)
+            row = list(shown[iid])
+            row[3] = status
+            shown[iid] = tuple(row)  # keep the diff state in step with the cell
+
     def _view_order_details_user(self):
         oid = self._get_selected_id_from_tree(self.user_tree)
         if not oid:
             return
-        self._open_details_window(oid)
+        self._open_details_window(oid, self._selected_status(self.user_tree))
 
     def _view_order_details_admin(self):
         oid = self._get_selected_id_from_tree(self.admin_tree)
         if not oid:
             return
-        self._open_details_window(oid)
+        self._open_details_window(oid, self._selected_status(self.admin_tree))
 
-    def _open_details_window(self, oid: int):
-        items, total = self.db.get_order_items(oid)
+    def _open_details_window(self, oid: int, status: str, address: Optional[str] = None):
+        # one builder for every details window; courier rows pass their delivery address
+        items, total = self._order_items(oid, status)
         win = tk.Toplevel(self)
-        win.title(f"Order #{oid} details")
-        win.geometry("560x380")
+        if address is None:
+            win.title(f"Order #{oid} details")
+            win.geometry("560x380")
+        else:
+            win.title(f"Order #{oid} (Delivery)")
+            win.geometry("600x420")
         win.transient(self)
         win.grab_set()
 
-        cols = ("Item", "Qty", "Price", "Subtotal")
-        tv = ttk.Treeview(win, columns=cols, show="headings")
-        for c in cols:
-            tv.heading(c, text=c)
-        tv.column("Item", width=240)
-        tv.column("Qty", width=60, anchor="center")
-        tv.column("Price", width=100, anchor="e")
-        tv.column("Subtotal", width=120, anchor="e")
-        tv.pack(fill="both", expand=True, padx=10, pady=10)
-
-        for name, qty, price, sub in items:
-            tv.insert("", "end", values=(name, qty, f"{price:.2f}", f"{sub:.2f}"))
-
-        tk.Label(win, text=f"Total: {total:.2f}", font=("Segoe UI", 11, "bold"))\
-            .pack(anchor="e", padx=12, pady=(0, 10))
-        tk.Button(win, text="Close", command=win.destroy).pack(pady=(0, 10))
+        if address is not None:
+            tk.Label(win, text=f"Delivery address: {address}", font=("Segoe UI", 10, "bold"))\
+                .pack(anchor="w", padx=10, pady=(10, 0))
 
-    def _open_details_window_with_address(self, oid: int, address: str):
-        items, total = self.db.get_order_items(oid)
-        win = tk.Toplevel(self)
-        win.title(f"Order #{oid} (Delivery)")
-        win.geometry("600x420")
-        win.transient(self)
-        win.grab_set()
-
-        tk.Label(win, text=f"Delivery address: {address}", font=("Segoe UI", 10, "bold"))\
-            .pack(anchor="w", padx=10, pady=(10, 0))
-
-        cols = ("Item", "Qty", "Price", "Subtotal")
-        tv = ttk.Treeview(win, columns=cols, show="headings")
-        for c in cols:
-            tv.heading(c, text=c)
-        tv.column("Item", width=260)
-        tv.column("Qty", width=60, anchor="center")
-        tv.column("Price", width=100, anchor="e")
-        tv.column("Subtotal", width=120, anchor="e")
+        tv = _build_tree(win, DETAILS_TREE_COLUMNS)
         tv.pack(fill="both", expand=True, padx=10, pady=10)
 
-        for name, qty, price, sub in items:
-            tv.insert("", "end", values=(name, qty, f"{price:.2f}", f"{sub:.2f}"))
+        # price/subtotal are DECIMAL(.., 2) from the DB, so they already render as e.g. "12.50"
+        insert = tv.insert
+        for row in items:
+            insert("", "end", values=row)
 
         tk.Label(win, text=f"Total: {total:.2f}", font=("Segoe UI", 11, "bold"))\
             .pack(anchor="e", padx=12, pady=(0, 10))
@@ -541,9 +747,21 @@ Accordingly, the tab(s) inside Admin opens.
         except ValueError as e:
             messagebox.showerror("Error", str(e))
             return
-        self._reload_orders_admin()
+        self._order_status_changed(self.admin_tree, self.a_status_sel, self._reload_orders_admin, choice, oid)
 
     def _cancel_order_admin(self):
+        sel = self.admin_tree.selection()
+        if len(sel) > 1:
+            oids = [int(self.admin_tree.item(i, "values")[0]) for i in sel]
+            if not messagebox.askyesno("Cancel", f"Cancel {len(oids)} selected orders?"):
+                return
+            done = self.db.cancel_orders_bulk(oids)
+            if len(done) < len(oids):
+                messagebox.showwarning("Cancel", f"{len(oids) - len(done)} of {len(oids)} orders "
+                                                 f"could not be canceled (already closed).")
+            self._order_status_changed(self.admin_tree, self.a_status_sel, self._reload_orders_admin,
+                                       "CANCELED", *done)
+            return
         oid = self._get_selected_id_from_tree(self.admin_tree)
         if not oid:
             return
@@ -554,7 +772,7 @@ Accordingly, the tab(s) inside Admin opens.
         except ValueError as e:
             messagebox.showerror("Error", str(e))
             return
-        self._reload_orders_admin()
+        self._order_status_changed(self.admin_tree, self.a_status_sel, self._reload_orders_admin, "CANCELED", oid)
 
     # user actions
     def _user_cancel_order(self):
@@ -572,8 +790,8 @@ Accordingly, the tab(s) inside Admin opens.
         except (ValueError, PermissionError) as e:
             messagebox.showerror("Error", str(e))
             return
+        self._order_status_changed(self.user_tree, self.u_status_sel, self._reload_orders_user, "CANCELED", oid)
         messagebox.showinfo("Canceled", f"Order #{oid} canceled.")
-        self._reload_orders_user()
 
     # Admin tab (UI)
     def _maybe_add_admin_tab(self):
@@ -615,6 +833,18 @@ Accordingly, the tab(s) inside Admin opens.
         elif area == "courier":
             self._add_courier_subtab()
 
+    def _load_on_first_show(self, nb: ttk.Notebook, tab: tk.Widget, loader) -> None:
+        # pages that are not on screen yet fill themselves (DB query + rows) when first selected
+        if nb not in self._first_show:
+            self._first_show[nb] = {}
+            nb.bind("<<NotebookTabChanged>>", lambda e: self._on_tab_shown(nb), add="+")
+        self._first_show[nb][str(tab)] = loader
+
+    def _on_tab_shown(self, nb: ttk.Notebook) -> None:
+        loader = self._first_show[nb].pop(nb.select(), None)
+        if loader:
+            loader()
+
     # Admin/Menu management (tabs)
     def _build_admin_menu_tab(self):
         tab = tk.Frame(self.admin_nb)
@@ -625,9 +855,8 @@ Accordingly, the tab(s) inside Admin opens.
 
         tk.Label(left, text="Category:").grid(row=0, column=0, sticky="w", padx=6, pady=(8, 2))
         self.admin_categories = self.db.get_categories()
-        self.admin_cat_by_name = {name: cid for cid, name in self.admin_categories}
+        self.admin_cat_by_name, cat_names = _index_categories(self.admin_categories)
         self.admin_cat_sel = tk.StringVar()
-        cat_names = [n for _, n in self.admin_categories]
         self.admin_cat_combo = ttk.Combobox(left, textvariable=self.admin_cat_sel, values=cat_names,
                                             state="readonly", width=22)
         self.admin_cat_combo.grid(row=1, column=0, padx=6, pady=(0, 6))
@@ -642,7 +871,7 @@ Accordingly, the tab(s) inside Admin opens.
         tk.Entry(left, textvariable=self.admin_item_name, width=24).grid(row=4, column=0, padx=6, pady=(0, 6))
 
         tk.Label(left, text="Price:").grid(row=5, column=0, sticky="w", padx=6, pady=(6, 2))
-        self.admin_item_price = tk.DoubleVar(value=0.0)
+        self.admin_item_price = tk.StringVar(value="0.00")
         tk.Entry(left, textvariable=self.admin_item_price, width=24).grid(row=6, column=0, padx=6, pady=(0, 6))
 
         self.admin_item_active = tk.IntVar(value=1)
@@ -657,13 +886,7 @@ Accordingly, the tab(s) inside Admin opens.
 
         right = tk.LabelFrame(tab, text="Items")
         right.pack(side="right", fill="both", expand=True, padx=10, pady=10)
-        self.admin_items_tree = ttk.Treeview(right, columns=("ID", "Name", "Price", "Active"), show="headings")
-        for c in ("ID", "Name", "Price", "Active"):
-            self.admin_items_tree.heading(c, text=c)
-        self.admin_items_tree.column("ID", width=60, anchor="center")
-        self.admin_items_tree.column("Name", width=260)
-        self.admin_items_tree.column("Price", width=120, anchor="e")
-        self.admin_items_tree.column("Active", width=80, anchor="center")
+        self.admin_items_tree = _build_tree(right, MENU_TREE_COLUMNS)
         self.admin_items_tree.pack(fill="both", expand=True, padx=6, pady=6)
         self.admin_items_tree.bind("<ButtonRelease-1>", lambda e: self._admin_item_row_selected())
 
@@ -672,38 +895,52 @@ Accordingly, the tab(s) inside Admin opens.
         self._admin_refresh_items()
 
     def _admin_refresh_items(self):
-        for i in self.admin_items_tree.get_children():
-            self.admin_items_tree.delete(i)
         cat = self.admin_cat_sel.get()
         if not cat:
+            self._sync_tree(self.admin_items_tree, {})
             return
         cid = self.admin_cat_by_name[cat]
         self.admin_items_cache = self.db.get_menu_items(category_id=cid, active_only=False)
-        for iid, name, price, _cid, active in self.admin_items_cache:
-            self.admin_items_tree.insert("", "end", values=(iid, name, f"{price:.2f}", "Yes" if active else "No"))
-
-        # sync with custom tab
-        self.categories = self.db.get_categories()
-        self.cat_id_by_name = {n: i for i, n in self.categories}
-        self.cat_combo["values"] = [n for _, n in self.categories]
-        if self.cat_sel.get() and self.cat_sel.get() in self.cat_id_by_name:
+        # rows are keyed by item id, so a selection maps straight back to its menu record
+        self.admin_items_by_id = {row[0]: row for row in self.admin_items_cache}
+        self._sync_menu_tree(self.admin_items_tree, self.admin_items_cache)
+
+        # sync with custom tab; categories only change in _admin_reload_categories, and the
+        # item list comes from the db menu cache unless an edit just invalidated it
+        if self.cat_sel.get() == cat:
             self._load_items_for_category()
 
+    def _admin_reload_categories(self, select: str):
+        # one get_categories() feeds both the admin and the custom-order combos
+        categories = self.db.get_categories()
+        self.admin_categories = categories
+        self.admin_cat_by_name, names = _index_categories(categories)  # names shared by both combos
+        self.admin_cat_combo["values"] = names
+        self.admin_cat_sel.set(select if select in self.admin_cat_by_name else (names[0] if names else ""))
+
+        self.categories = categories
+        self.cat_id_by_name = dict(self.admin_cat_by_name)
+        self.cat_combo["values"] = names
+        if self.cat_sel.get() not in self.cat_id_by_name:
+            self.cat_sel.set(names[0] if names else "")
+            self._load_items_for_category()
+        self._admin_refresh_items()
+
     def _admin_item_row_selected(self):
         sel = self.admin_items_tree.focus()
         if not sel:
             return
-        iid, name, price, active = self.admin_items_tree.item(sel, "values")
-        self.editing_item_id = int(iid)
+        iid, name, price, _cid, active = self.admin_items_by_id[int(sel)]
+        self.editing_item_id = iid
         self.admin_item_name.set(name)
-        self.admin_item_price.set(float(price))
-        self.admin_item_active.set(1 if active == "Yes" else 0)
+        self.admin_item_price.set(f"{price:.2f}")
+        self.admin_item_active.set(1 if active else 0)
         self.btn_admin_update.config(state="normal")
 
     def _admin_clear_item_form(self):
         self.editing_item_id = None
         self.admin_item_name.set("")
-        self.admin_item_price.set(0.0)
+        self.admin_item_price.set("0.00")
         self.admin_item_active.set(1)
         self.btn_admin_update.config(state="disabled")
 
@@ -718,11 +955,7 @@ Accordingly, the tab(s) inside Admin opens.
                 messagebox.showerror("Error", "Category already exists.")
                 return
             raise
-        self.admin_categories = self.db.get_categories()
-        self.admin_cat_by_name = {n: i for i, n in self.admin_categories}
-        self.admin_cat_combo["values"] = [n for _, n in self.admin_categories]
-        self.admin_cat_sel.set(name.strip())
-        self._admin_refresh_items()
+        self._admin_reload_categories(name.strip())
 
     def _admin_delete_category(self):
         cat = self.admin_cat_sel.get()
@@ -739,12 +972,7 @@ Accordingly, the tab(s) inside Admin opens.
                 messagebox.showerror("Blocked", "Category has items. Move or delete them first.")
                 return
             raise
-        self.admin_categories = self.db.get_categories()
-        self.admin_cat_by_name = {n: i for i, n in self.admin_categories}
-        names = [n for _, n in self.admin_categories]
-        self.admin_cat_combo["values"] = names
-        self.admin_cat_sel.set(names[0] if names else "")
-        self._admin_refresh_items()
+        self._admin_reload_categories("")
 
     def _admin_add_item(self):
         cat = self.admin_cat_sel.get()
@@ -754,7 +982,7 @@ Accordingly, the tab(s) inside Admin opens.
         name = self.admin_item_name.get().strip()
         try:
             price = float(self.admin_item_price.get())
-        except Exception:
+        except ValueError:
             messagebox.showerror("Error", "Price must be a number.")
             return
         if not name or price < 0:
@@ -778,7 +1006,7 @@ Accordingly, the tab(s) inside Admin opens.
         name = self.admin_item_name.get().strip()
         try:
             price = float(self.admin_item_price.get())
-        except Exception:
+        except ValueError:
             messagebox.showerror("Error", "Price must be a number.")
             return
         try:
@@ -788,6 +1016,7 @@ Accordingly, the tab(s) inside Admin opens.
                 messagebox.showerror("Error", "Another item with this name already exists.")
                 return
             raise
+        self._order_items_cache.clear()  # details show the item name, which may have changed
         self._admin_clear_item_form()
         self._admin_refresh_items()
 
@@ -801,7 +1030,7 @@ Accordingly, the tab(s) inside Admin opens.
         tk.Label(filter_bar, text="Status:").pack(side="left")
         self.admin_status_sel2 = tk.StringVar(value="")
         ttk.Combobox(filter_bar, textvariable=self.admin_status_sel2,
-                     values=["", "RECEIVED", "IN_PROGRESS", "READY", "COMPLETED", "CANCELED"],
+                     values=STATUS_FILTER_VALUES,
                      width=14, state="readonly").pack(side="left", padx=(4, 10))
         tk.Label(filter_bar, text="Search:").pack(side="left")
         self.admin_search_var2 = tk.StringVar()
@@ -809,15 +1038,11 @@ Accordingly, the tab(s) inside Admin opens.
             .pack(side="left", padx=(4, 8))
         tk.Button(filter_bar, text="Apply", command=self._admin_reload_orders_tab).pack(side="left")
 
-        cols = ("ID", "Date", "Customer", "Status", "Total")
-        self.admin_orders_tree2 = ttk.Treeview(tab, columns=cols, show="headings")
-        for c in cols:
-            self.admin_orders_tree2.heading(c, text=c)
-        self.admin_orders_tree2.column("ID", width=70, anchor="center")
-        self.admin_orders_tree2.column("Date", width=150)
-        self.admin_orders_tree2.column("Customer", width=220)
-        self.admin_orders_tree2.column("Status", width=120, anchor="center")
-        self.admin_orders_tree2.column("Total", width=90, anchor="e")
+        self.admin_orders_tree2 = _build_tree(tab, ORDER_TREE_COLUMNS)
+        self._page_on_scroll(self.admin_orders_tree2)
+        self._reload_on_filter_change(
+            self.admin_orders_tree2, self._admin_reload_orders_tab, self.admin_status_sel2, self.admin_search_var2
+        )
         self.admin_orders_tree2.pack(fill="both", expand=True, padx=10, pady=10)
         self.admin_orders_tree2.bind("<Double-1>", lambda e: self._view_order_details_admin_tab())
 
@@ -828,21 +1053,16 @@ Accordingly, the tab(s) inside Admin opens.
         tk.Button(btns, text="Cancel", command=self._admin_cancel_order_tab).pack(side="left")
         tk.Button(btns, text="Refresh", command=self._admin_reload_orders_tab).pack(side="right")
 
-        self._admin_reload_orders_tab()
+        self._load_on_first_show(self.admin_nb, tab, self._admin_reload_orders_tab)
 
     def _admin_reload_orders_tab(self):
-        for i in self.admin_orders_tree2.get_children():
-            self.admin_orders_tree2.delete(i)
-        status = self.admin_status_sel2.get() or None
-        search = self.admin_search_var2.get()
-        for oid, dt, cust, st, total in self.db.get_orders(status=status, search_text=search, limit=600):
-            self.admin_orders_tree2.insert("", "end", values=(oid, dt, cust, st, f"{total:.2f}"))
+        self._reload_order_tree(self.admin_orders_tree2, self.admin_status_sel2, self.admin_search_var2)
 
     def _view_order_details_admin_tab(self):
         oid = self._get_selected_id_from_tree(self.admin_orders_tree2)
         if not oid:
             return
-        self._open_details_window(oid)
+        self._open_details_window(oid, self._selected_status(self.admin_orders_tree2))
 
     def _admin_advance_status_tab(self):
         oid = self._get_selected_id_from_tree(self.admin_orders_tree2)
@@ -861,7 +1081,7 @@ Accordingly, the tab(s) inside Admin opens.
         except ValueError as e:
             messagebox.showerror("Error", str(e))
             return
-        self._admin_reload_orders_tab()
+        self._order_status_changed(self.admin_orders_tree2, self.admin_status_sel2, self._admin_reload_orders_tab, choice, oid)
 
     def _admin_cancel_order_tab(self):
         oid = self._get_selected_id_from_tree(self.admin_orders_tree2)
@@ -874,7 +1094,7 @@ Accordingly, the tab(s) inside Admin opens.
         except ValueError as e:
             messagebox.showerror("Error", str(e))
             return
-        self._admin_reload_orders_tab()
+        self._order_status_changed(self.admin_orders_tree2, self.admin_status_sel2, self._admin_reload_orders_tab, "CANCELED", oid)
 
     # Admin/Analytics
     def _build_admin_analytics_tab(self):
@@ -928,32 +1148,17 @@ Accordingly, the tab(s) inside Admin opens.
         split.pack(fill="both", expand=True, padx=10, pady=(0, 10))
 
         left = tk.LabelFrame(split, text="Orders")
-        cols_o = ("ID", "Date", "Customer", "Status", "Service", "Total")
-        self.an_orders_tree = ttk.Treeview(left, columns=cols_o, show="headings")
-        for c in cols_o:
-            self.an_orders_tree.heading(c, text=c)
-        self.an_orders_tree.column("ID", width=70, anchor="center")
-        self.an_orders_tree.column("Date", width=150)
-        self.an_orders_tree.column("Customer", width=200)
-        self.an_orders_tree.column("Status", width=120, anchor="center")
-        self.an_orders_tree.column("Service", width=100, anchor="center")
-        self.an_orders_tree.column("Total", width=100, anchor="e")
+        self.an_orders_tree = _build_tree(left, REPORT_ORDER_TREE_COLUMNS)
         self.an_orders_tree.pack(fill="both", expand=True, padx=6, pady=6)
 
         right = tk.LabelFrame(split, text="Top Items")
-        cols_i = ("Item", "Qty", "Revenue")
-        self.an_items_tree = ttk.Treeview(right, columns=cols_i, show="headings")
-        for c in cols_i:
-            self.an_items_tree.heading(c, text=c)
-        self.an_items_tree.column("Item", width=260)
-        self.an_items_tree.column("Qty", width=80, anchor="center")
-        self.an_items_tree.column("Revenue", width=120, anchor="e")
+        self.an_items_tree = _build_tree(right, REPORT_ITEM_TREE_COLUMNS)
         self.an_items_tree.pack(fill="both", expand=True, padx=6, pady=6)
 
         split.add(left)
         split.add(right)
 
-        self._run_analytics()
+        self._load_on_first_show(self.admin_nb, tab, self._run_analytics)
 
     def _parse_period(self) -> Optional[Tuple[str, str]]:
         try:
@@ -979,8 +1184,7 @@ Accordingly, the tab(s) inside Admin opens.
         statuses = self._selected_statuses()
 
         for t in (self.an_orders_tree, self.an_items_tree):
-            for i in t.get_children():
-                t.delete(i)
+            t.delete(*t.get_children())
 
         try:
             orders = self.db.report_orders(start_dt, end_dt, statuses=statuses)
@@ -988,11 +1192,15 @@ Accordingly, the tab(s) inside Admin opens.
             orders = self.db.get_orders(status=None, search_text="", limit=1000)
             orders = [(oid, dt, cust, st, "", total) for (oid, dt, cust, st, total) in orders]
 
-        total_revenue = 0.0
-        for oid, dt, cust, st, service, total in orders:
-            total_revenue += float(total)
-            self.an_orders_tree.insert("", "end",
-                                       values=(oid, dt, cust, st, service or "", f"{float(total):.2f}"))
+        # format every row first, then insert in a loop that makes nothing but Tcl calls; Tk
+        # already defers redraws to idle, so there is no per-row repaint to suppress
+        totals = [float(row[5]) for row in orders]
+        total_revenue = sum(totals)
+        shown = [(oid, dt, cust, st, service or "", f"{total:.2f}")
+                 for (oid, dt, cust, st, service, _), total in zip(orders, totals)]
+        insert = self.an_orders_tree.insert
+        for values in shown:
+            insert("", "end", values=values)
 
         count = len(orders)
         avg = (total_revenue / count) if count else 0.0
@@ -1004,8 +1212,10 @@ Accordingly, the tab(s) inside Admin opens.
             items = self.db.report_top_items(start_dt, end_dt, statuses=statuses, limit=20)
         except AttributeError:
             items = []
-        for name, qty, revenue in items:
-            self.an_items_tree.insert("", "end", values=(name, int(qty), f"{float(revenue):.2f}"))
+        shown = [(name, int(qty), f"{float(revenue):.2f}") for name, qty, revenue in items]
+        insert = self.an_items_tree.insert
+        for values in shown:
+            insert("", "end", values=values)
 
     def _export_orders_csv(self):
         period = self._parse_period()
@@ -1024,16 +1234,20 @@ Accordingly, the tab(s) inside Admin opens.
             return
 
         try:
-            rows = self.db.report_orders(start_dt, end_dt, statuses=statuses)
+            chunks = self.db.iter_report_orders(start_dt, end_dt, statuses=statuses)
         except AttributeError:
             rows = self.db.get_orders(status=None, search_text="", limit=1000)
-            rows = [(oid, dt, cust, st, "", total) for (oid, dt, cust, st, total) in rows]
+            chunks = [[(oid, dt, cust, st, "", total) for (oid, dt, cust, st, total) in rows]]
 
         with open(path, "w", newline="", encoding="utf-8") as f:
             w = csv.writer(f)
             w.writerow(["OrderID", "Date", "Customer", "Status", "ServiceType", "Total"])
-            for oid, dt, cust, st, service, total in rows:
-                w.writerow([oid, dt, cust, st, service or "", f"{float(total):.2f}"])
+            # written chunk by chunk, so a long period never sits in memory as a whole
+            for rows in chunks:
+                w.writerows(
+                    [oid, dt, cust, st, service or "", f"{float(total):.2f}"]
+                    for oid, dt, cust, st, service, total in rows
+                )
 
         messagebox.showinfo("Export", "Orders CSV saved.")
 
@@ -1080,22 +1294,16 @@ Accordingly, the tab(s) inside Admin opens.
         tk.Label(filt, text="Status:").pack(side="left")
         self.chef_status = tk.StringVar(value="")
         ttk.Combobox(filt, textvariable=self.chef_status,
-                     values=["", "RECEIVED", "IN_PROGRESS", "READY", "COMPLETED", "CANCELED"],
+                     values=STATUS_FILTER_VALUES,
                      width=14, state="readonly").pack(side="left", padx=(4, 10))
         tk.Label(filt, text="Search:").pack(side="left")
         self.chef_search = tk.StringVar()
         tk.Entry(filt, textvariable=self.chef_search, width=26).pack(side="left", padx=(4, 8))
         tk.Button(filt, text="Apply", command=self._reload_chef_orders).pack(side="left")
 
-        cols = ("ID", "Date", "Customer", "Status", "Total")
-        self.chef_tree = ttk.Treeview(orders_tab, columns=cols, show="headings", height=18)
-        for c in cols:
-            self.chef_tree.heading(c, text=c)
-        self.chef_tree.column("ID", width=70, anchor="center")
-        self.chef_tree.column("Date", width=150)
-        self.chef_tree.column("Customer", width=220)
-        self.chef_tree.column("Status", width=120, anchor="center")
-        self.chef_tree.column("Total", width=90, anchor="e")
+        self.chef_tree = _build_tree(orders_tab, ORDER_TREE_COLUMNS, height=18)
+        self._page_on_scroll(self.chef_tree)
+        self._reload_on_filter_change(self.chef_tree, self._reload_chef_orders, self.chef_status, self.chef_search)
         self.chef_tree.pack(fill="both", expand=True, padx=10, pady=10)
         self.chef_tree.bind("<Double-1>", lambda e: self._view_order_details_chef())
 
@@ -1112,42 +1320,31 @@ Accordingly, the tab(s) inside Admin opens.
         left = tk.Frame(menu_tab); left.pack(side="left", fill="y", padx=10, pady=10)
         tk.Label(left, text="Category:").grid(row=0, column=0, sticky="w")
         self.chef_cats = self.db.get_categories()
-        self.chef_cat_by_name = {n: i for i, n in self.chef_cats}
+        self.chef_cat_by_name, chef_names = _index_categories(self.chef_cats)
         self.chef_cat_sel = tk.StringVar()
         ttk.Combobox(left, textvariable=self.chef_cat_sel,
-                     values=[n for _, n in self.chef_cats], state="readonly", width=22)\
+                     values=chef_names, state="readonly", width=22)\
             .grid(row=1, column=0, sticky="w", pady=(2, 6))
         self.chef_cat_sel.trace_add("write", lambda *_: self._chef_refresh_menu())
 
         right = tk.LabelFrame(menu_tab, text="Items")
         right.pack(side="right", fill="both", expand=True, padx=10, pady=10)
-        self.chef_menu_tree = ttk.Treeview(right, columns=("ID", "Name", "Price", "Active"), show="headings")
-        for c in ("ID", "Name", "Price", "Active"):
-            self.chef_menu_tree.heading(c, text=c)
-        self.chef_menu_tree.column("ID", width=60, anchor="center")
-        self.chef_menu_tree.column("Name", width=260)
-        self.chef_menu_tree.column("Price", width=120, anchor="e")
-        self.chef_menu_tree.column("Active", width=80, anchor="center")
+        self.chef_menu_tree = _build_tree(right, MENU_TREE_COLUMNS)
         self.chef_menu_tree.pack(fill="both", expand=True, padx=6, pady=6)
 
         if self.chef_cats:
-            self.chef_cat_sel.set(self.chef_cats[0][1])
+            self._load_on_first_show(nb, menu_tab, lambda: self.chef_cat_sel.set(self.chef_cats[0][1]))
 
     def _reload_chef_orders(self):
         if not hasattr(self, "chef_tree"):
             return
-        for i in self.chef_tree.get_children():
-            self.chef_tree.delete(i)
-        status = self.chef_status.get() or None
-        search = self.chef_search.get()
-        for oid, dt, cust, st, total in self.db.get_orders(status=status, search_text=search, limit=600):
-            self.chef_tree.insert("", "end", values=(oid, dt, cust, st, f"{total:.2f}"))
+        self._reload_order_tree(self.chef_tree, self.chef_status, self.chef_search)
 
     def _view_order_details_chef(self):
         oid = self._get_selected_id_from_tree(self.chef_tree)
         if not oid:
             return
-        self._open_details_window(oid)
+        self._open_details_window(oid, self._selected_status(self.chef_tree))
 
     def _chef_advance_status(self):
         oid = self._get_selected_id_from_tree(self.chef_tree)
@@ -1166,7 +1363,7 @@ Accordingly, the tab(s) inside Admin opens.
         except ValueError as e:
             messagebox.showerror("Error", str(e))
             return
-        self._reload_chef_orders()
+        self._order_status_changed(self.chef_tree, self.chef_status, self._reload_chef_orders, choice, oid)
 
     def _chef_cancel(self):
         oid = self._get_selected_id_from_tree(self.chef_tree)
@@ -1179,18 +1376,15 @@ Accordingly, the tab(s) inside Admin opens.
         except ValueError as e:
             messagebox.showerror("Error", str(e))
             return
-        self._reload_chef_orders()
+        self._order_status_changed(self.chef_tree, self.chef_status, self._reload_chef_orders, "CANCELED", oid)
 
     def _chef_refresh_menu(self):
-        for i in self.chef_menu_tree.get_children():
-            self.chef_menu_tree.delete(i)
         cat = self.chef_cat_sel.get()
         if not cat:
+            self._sync_tree(self.chef_menu_tree, {})
             return
         cid = self.chef_cat_by_name.get(cat)
-        rows = self.db.get_menu_items(category_id=cid, active_only=False)
-        for iid, name, price, _cid, active in rows:
-            self.chef_menu_tree.insert("", "end", values=(iid, name, f"{price:.2f}", "Yes" if active else "No"))
+        self._sync_menu_tree(self.chef_menu_tree, self.db.get_menu_items(category_id=cid, active_only=False))
 
     def _add_courier_subtab(self):
         parent = tk.Frame(self.admin_nb)
@@ -1200,23 +1394,18 @@ Accordingly, the tab(s) inside Admin opens.
         tk.Label(filt, text="Status:").pack(side="left")
         self.courier_status = tk.StringVar(value="")
         ttk.Combobox(filt, textvariable=self.courier_status,
-                     values=["", "RECEIVED", "IN_PROGRESS", "READY", "COMPLETED", "CANCELED"],
+                     values=STATUS_FILTER_VALUES,
                      width=14, state="readonly").pack(side="left", padx=(4, 10))
         tk.Label(filt, text="Search:").pack(side="left")
         self.courier_search = tk.StringVar()
         tk.Entry(filt, textvariable=self.courier_search, width=26).pack(side="left", padx=(4, 8))
         tk.Button(filt, text="Apply", command=self._reload_courier_orders).pack(side="left")
 
-        cols = ("ID", "Date", "Customer", "Status", "Total", "Address")
-        self.courier_tree = ttk.Treeview(parent, columns=cols, show="headings")
-        for c in cols:
-            self.courier_tree.heading(c, text=c)
-        self.courier_tree.column("ID", width=70, anchor="center")
-        self.courier_tree.column("Date", width=150)
-        self.courier_tree.column("Customer", width=180)
-        self.courier_tree.column("Status", width=120, anchor="center")
-        self.courier_tree.column("Total", width=90, anchor="e")
-        self.courier_tree.column("Address", width=260)
+        self.courier_tree = _build_tree(parent, DELIVERY_TREE_COLUMNS)
+        self._page_on_scroll(self.courier_tree)
+        self._reload_on_filter_change(
+            self.courier_tree, self._reload_courier_orders, self.courier_status, self.courier_search
+        )
         self.courier_tree.pack(fill="both", expand=True, padx=10, pady=10)
         self.courier_tree.bind("<Double-1>", lambda e: self._view_order_details_courier())
 
@@ -1231,13 +1420,16 @@ Accordingly, the tab(s) inside Admin opens.
     def _reload_courier_orders(self):
         if not hasattr(self, "courier_tree"):
             return
-        for i in self.courier_tree.get_children():
-            self.courier_tree.delete(i)
+        # same path as the other order lists: fetched off the Tk thread, diffed in, next page
+        # appended when scrolled to the bottom
         status = self.courier_status.get() or None
         search = self.courier_search.get()
-        rows = self.db.get_delivery_orders(status=status, search_text=search, limit=600)
-        for oid, dt, cust, st, total, addr in rows:
-            self.courier_tree.insert("", "end", values=(oid, dt, cust, st, f"{total:.2f}", addr))
+        self._load_order_tree(
+            self.courier_tree,
+            lambda limit, after_id: self.db.get_delivery_orders(
+                status=status, search_text=search, limit=limit, after_id=after_id
+            ),
+        )
 
     def _view_order_details_courier(self):
         sel = self.courier_tree.focus()
@@ -1245,8 +1437,7 @@ Accordingly, the tab(s) inside Admin opens.
             return
         vals = self.courier_tree.item(sel, "values")
         oid = int(vals[0])
-        addr = vals[5]
-        self._open_details_window_with_address(oid, addr)
+        self._open_details_window(oid, vals[3], address=vals[5])
 
     def _courier_advance_status(self):
         oid = self._get_selected_id_from_tree(self.courier_tree)
@@ -1265,7 +1456,7 @@ Accordingly, the tab(s) inside Admin opens.
         except ValueError as e:
             messagebox.showerror("Error", str(e))
             return
-        self._reload_courier_orders()
+        self._order_status_changed(self.courier_tree, self.courier_status, self._reload_courier_orders, choice, oid)
 
     def _courier_cancel(self):
         oid = self._get_selected_id_from_tree(self.courier_tree)
@@ -1278,7 +1469,7 @@ Accordingly, the tab(s) inside Admin opens.
         except ValueError as e:
             messagebox.showerror("Error", str(e))
             return
-        self._reload_courier_orders()
+        self._order_status_changed(self.courier_tree, self.courier_status, self._reload_courier_orders, "CANCELED", oid)
 
     # account ops
     def _change_password(self):
@@ -1321,6 +1512,7 @@ Accordingly, the tab(s) inside Admin opens.
             messagebox.showerror("Error", str(e))
 
     def _logout(self):
+        self._db_worker.shutdown(wait=False, cancel_futures=True)
         try:
             self.on_logout()
         finally:
@@ -16,7 +16,7 @@ cnx = mysql.connector.connect(
 cur = cnx.cursor()
 
 new_pw = "rootpasswordilovemaya2003200716042007"
-hash_ = bcrypt.hashpw(new_pw.encode(), bcrypt.gensalt()).decode()
+hash_ = bcrypt.hashpw(new_pw.encode(), bcrypt.gensalt(rounds=int(os.getenv("BCRYPT_COST", "12")))).decode()
 
 cur.execute("UPDATE Users SET password_hash=%s WHERE role='admin' LIMIT 1", (hash_,))
 cnx.commit()